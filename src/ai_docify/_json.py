@@ -0,0 +1,34 @@
+"""
+JSON helpers that use the optional ``orjson`` accelerator when it is installed.
+
+Both decoders accept ``bytes`` and handle UTF-8 themselves, and both encoders
+return UTF-8 ``bytes``, so callers behave the same with or without the
+``fast`` extra.
+"""
+
+import json
+from typing import Any
+
+try:
+    from orjson import dumps, loads
+except ImportError:  # pragma: no cover - depends on the environment
+    loads = json.loads
+
+    def dumps(obj: Any) -> bytes:
+        """
+        Serialize an object to UTF-8 encoded JSON.
+
+        Parameters
+        ----------
+        obj : Any
+            The JSON-serializable object.
+
+        Returns
+        -------
+        bytes
+            The encoded document.
+        """
+        return json.dumps(obj).encode("utf-8")
+
+
+__all__ = ["dumps", "loads"]
@@ -14,26 +14,43 @@ to perform the core AI and pricing work.
 """
 
 import os
-import json
 import sys
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 import click
 from dotenv import load_dotenv
-from rich.console import Console
-from rich.prompt import Confirm
-import importlib.metadata
 
-from .generator import generate_documentation, AIDocifyError
+from .generator import (
+    generate_documentation,
+    prepare_llm_payload,
+    create_client,
+    AIDocifyError,
+)
 from .utils import estimate_cost, calculate_token_cost
 from .config import get_model_price, validate_model, load_config
-from .stripper import strip_docstrings
+from ._json import dumps as _json_dumps
 
-load_dotenv()
+# Rich is imported where it is used: it dominates start-up time for the
+# commands that never print through it (`config`, `generate --check`).
+if TYPE_CHECKING:
+    from rich.console import Console
 
 
 # --- File I/O Helpers ---
+
+
 def read_file(filepath: str) -> str:
     """
     Read the contents of a file as UTF-8 text.
@@ -48,10 +65,8 @@ def read_file(filepath: str) -> str:
     str
         The file contents.
     """
-    path_obj: Path = Path(filepath)
     try:
-        with path_obj.open("r", encoding="utf-8") as f:
-            return f.read()
+        return Path(filepath).read_text(encoding="utf-8")
     except OSError as e:
         raise IOError(f"Failed to read file {filepath}: {e}") from e
 
@@ -76,15 +91,55 @@ def write_output_file(output_dir: Path, filename: str, content: str) -> Path:
     """
     output_dir.mkdir(exist_ok=True)
     output_path: Path = output_dir / filename
+    # Written beside the target and renamed over it, so readers never see a
+    # partial file; unique per process and thread for concurrent batch runs
+    tmp_path = f"{output_path}.{os.getpid()}.{threading.get_ident()}.tmp"
     try:
-        with output_path.open("w", encoding="utf-8") as f:
-            f.write(content)
+        # Single-shot write straight to the fd, bypassing the buffered text layers
+        data = memoryview(content.encode("utf-8"))
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            while data:
+                data = data[os.write(fd, data) :]
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, output_path)
         return output_path
     except OSError as e:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
         raise IOError(f"Failed to write file {output_path}: {e}") from e
 
 
+def output_filename(filepath: str) -> str:
+    """
+    Return the name of the documented output file for a source file.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the source file.
+
+    Returns
+    -------
+    str
+        The source file's stem with a ``.doc.py`` suffix.
+    """
+    stem = os.path.splitext(os.path.basename(filepath))[0]
+    return f"{stem}.doc.py"
+
+
 # --- Secure API Key Handling ---
+# Maps provider name to a callable returning its API key (None if unset)
+_API_KEY_FETCHERS: Dict[str, Callable[[], Optional[str]]] = {
+    "openai": lambda: os.getenv("OPENAI_API_KEY") or None,
+    # Ollama is local, no API key needed
+    "ollama": lambda: "ollama",
+}
+
+
 def get_api_key(provider: str) -> Optional[str]:
     """
     Securely retrieve API key for the specified provider.
@@ -99,19 +154,19 @@ def get_api_key(provider: str) -> Optional[str]:
     Optional[str]
         The API key if found, None otherwise.
     """
-    if provider.lower() == "openai":
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            return None
-        return api_key
-    elif provider.lower() == "ollama":
-        # Ollama is local, no API key needed
-        return "ollama"
-    return None
+    fetcher = _API_KEY_FETCHERS.get(provider.lower())
+    return fetcher() if fetcher else None
 
 
 # --- Console Helpers ---
-def print_estimation(console: Console, estimates: Dict[str, Any]) -> None:
+# Static report lines, as Rich markup
+_ESTIMATION_HEADER = "\n[bold]Estimation (Input Only):[/bold]"
+_ESTIMATION_FREE = "   Est. Cost: [bold blue]Free (Local/Ollama)[/]"
+_REPORT_HEADER = "\n[bold]Final Usage Report:[/bold]"
+_REPORT_FREE = "   Total Cost:    [bold blue]Free[/]"
+
+
+def print_estimation(console: "Console", estimates: Dict[str, Any]) -> None:
     """
     Print a pre-flight estimation of tokens and cost.
 
@@ -122,16 +177,24 @@ def print_estimation(console: Console, estimates: Dict[str, Any]) -> None:
     estimates : dict
         Estimation dictionary returned from estimate_cost().
     """
-    console.print("\n[bold]Estimation (Input Only):[/bold]")
-    console.print(f"   Tokens: [cyan]{estimates.get('tokens')}[/]")
+    from rich.text import Text
+
+    lines: List[Any] = [
+        _ESTIMATION_HEADER,
+        Text.assemble("   Tokens: ", (str(estimates.get("tokens")), "cyan")),
+    ]
 
     if estimates.get("currency") == "USD":
-        console.print(f"   Est. Cost: [green]${estimates.get('input_cost', 0):.5f}[/]")
+        cost = f"${estimates.get('input_cost', 0):.5f}"
+        lines.append(Text.assemble("   Est. Cost: ", (cost, "green")))
     else:
-        console.print("   Est. Cost: [bold blue]Free (Local/Ollama)[/]")
+        lines.append(_ESTIMATION_FREE)
 
+    # One print call: a single render pass and stdout write for the block
+    console.print(*lines, sep="\n")
 
-def prompt_confirmation(console: Console) -> bool:
+
+def prompt_confirmation(console: "Console") -> bool:
     """
     Prompt the user for confirmation using a yes/no dialog.
 
@@ -145,12 +208,14 @@ def prompt_confirmation(console: Console) -> bool:
     bool
         True if the user confirmed, False otherwise.
     """
+    from rich.prompt import Confirm
+
     console.print("")
     return Confirm.ask("Do you want to proceed?")
 
 
 def print_final_usage_report(
-    console: Console, usage_stats: Dict[str, int], provider: str, model: str
+    console: "Console", usage_stats: Dict[str, int], provider: str, model: str
 ) -> None:
     """
     Print the final usage report with token counts and estimated cost.
@@ -160,53 +225,132 @@ def print_final_usage_report(
     console : rich.console.Console
         Console object to print to.
     usage_stats : dict
-        Dictionary with keys 'input_tokens', 'output_tokens', 'reasoning_tokens'.
+        Dictionary with keys 'input_tokens', 'output_tokens', 'reasoning_tokens'
+        and optionally 'cached_input_tokens'.
     provider : str
         Provider name used for pricing lookup.
     model : str
         Model name used for pricing lookup.
 
     """
+    from rich.text import Text
+
     try:
         price_info = get_model_price(provider, model)
         input_price = price_info.get("input_cost_per_million", 0)
         output_price = price_info.get("output_cost_per_million", 0)
+        # Cached prompt tokens are billed at the discounted rate when one is known
+        cached_price = price_info.get("cached_input_cost_per_million", input_price)
 
         in_tokens = usage_stats.get("input_tokens", 0)
         out_tokens = usage_stats.get("output_tokens", 0)
         reasoning_tokens = usage_stats.get("reasoning_tokens", 0)
+        cached_tokens = min(usage_stats.get("cached_input_tokens", 0), in_tokens)
 
         total_cost = 0.0
-        console.print("\n[bold]Final Usage Report:[/bold]")
+        lines: List[Any] = [_REPORT_HEADER]
 
         if input_price > 0:
-            input_cost = calculate_token_cost(in_tokens, input_price)
+            input_cost = calculate_token_cost(
+                in_tokens - cached_tokens, input_price
+            ) + calculate_token_cost(cached_tokens, cached_price)
             output_cost = calculate_token_cost(out_tokens, output_price)
             total_cost = input_cost + output_cost
 
-            console.print(f"   Input Tokens:     [cyan]{in_tokens}[/]")
-            console.print(f"   Output Tokens:    [cyan]{out_tokens}[/]")
+            lines.append(
+                Text.assemble("   Input Tokens:     ", (str(in_tokens), "cyan"))
+            )
+            if cached_tokens > 0:
+                lines.append(
+                    Text.assemble(
+                        "   (Includes ",
+                        (str(cached_tokens), "yellow"),
+                        " cached tokens)",
+                    )
+                )
+            lines.append(
+                Text.assemble("   Output Tokens:    ", (str(out_tokens), "cyan"))
+            )
 
             if reasoning_tokens > 0:
-                console.print(
-                    f"   (Includes [yellow]{reasoning_tokens}[/] reasoning tokens)"
+                lines.append(
+                    Text.assemble(
+                        "   (Includes ",
+                        (str(reasoning_tokens), "yellow"),
+                        " reasoning tokens)",
+                    )
                 )
 
-            console.print(f"   Total Cost:       [bold green]${total_cost:.5f}[/]")
+            lines.append(
+                Text.assemble(
+                    "   Total Cost:       ", (f"${total_cost:.5f}", "bold green")
+                )
+            )
         else:
             # Local or free providers: only show tokens and Free
-            console.print(f"   Output Tokens: [cyan]{out_tokens}[/]")
-            console.print("   Total Cost:    [bold blue]Free[/]")
+            lines.append(Text.assemble("   Output Tokens: ", (str(out_tokens), "cyan")))
+            lines.append(_REPORT_FREE)
+
+        # One print call: a single render pass and stdout write for the block
+        console.print(*lines, sep="\n")
     except Exception as e:
         console.print(f"[yellow]Warning: Could not generate usage report: {e}[/]")
 
 
+# --- Click Helpers ---
+class _FastChoice(click.Choice):
+    """
+    Click Choice type that resolves valid values with a single dict lookup.
+
+    Invalid values fall through to click.Choice so error messages are unchanged.
+    """
+
+    def __init__(self, choices: Sequence[str], case_sensitive: bool = True) -> None:
+        super().__init__(choices, case_sensitive=case_sensitive)
+        self._lookup: Dict[str, str] = {
+            (c if case_sensitive else c.lower()): c for c in choices
+        }
+
+    def convert(
+        self, value: Any, param: Optional[click.Parameter], ctx: Optional[click.Context]
+    ) -> Any:
+        """
+        Convert a raw option value into its canonical choice.
+
+        Parameters
+        ----------
+        value : Any
+            The raw value supplied on the command line.
+        param : click.Parameter, optional
+            The parameter being converted.
+        ctx : click.Context, optional
+            The current Click context.
+
+        Returns
+        -------
+        Any
+            The canonical choice matching ``value``.
+        """
+        if isinstance(value, str):
+            key = value if self.case_sensitive else value.lower()
+            canonical = self._lookup.get(key)
+            if canonical is not None:
+                return canonical
+        return super().convert(value, param, ctx)
+
+
+# Shared by generate and generate-batch
+_PROVIDER_CHOICE = _FastChoice(("openai", "ollama"), case_sensitive=False)
+_MODE_CHOICE = _FastChoice(("rewrite", "inject"), case_sensitive=False)
+
+
 # --- CLI Group ---
 @click.group()
-@click.version_option(version=importlib.metadata.version("ai-docify"))
+@click.version_option(package_name="ai-docify")
 def main() -> None:
     """ai-docify: A CLI for generating Python docstrings with AI."""
-    pass
+    # Deferred so plain imports and top-level --help/--version skip the .env lookup
+    load_dotenv()
 
 
 # --- Clean Command ---
@@ -224,6 +368,9 @@ def clean(output_dir: str, yes: bool) -> None:
     yes : bool
         If True, skip confirmation prompt.
     """
+    from rich.console import Console
+    from rich.prompt import Confirm
+
     console = Console()
     output_dir_path = Path(output_dir)
 
@@ -231,7 +378,9 @@ def clean(output_dir: str, yes: bool) -> None:
         console.print(f"Directory [cyan]{output_dir}[/] not found. Nothing to do.")
         return
 
-    files_to_delete = [f for f in output_dir_path.iterdir() if f.is_file()]
+    # scandir answers is_file() from the directory entry, without a stat per file
+    with os.scandir(output_dir_path) as entries:
+        files_to_delete = [e for e in entries if e.is_file()]
 
     if not files_to_delete:
         console.print(f"Directory [cyan]{output_dir}[/] is already empty.")
@@ -240,8 +389,7 @@ def clean(output_dir: str, yes: bool) -> None:
     console.print(
         f"The following files will be [bold red]deleted[/] from [cyan]{output_dir}[/]:"
     )
-    for f in files_to_delete:
-        console.print(f"  - {f.name}")
+    console.print("\n".join(f"  - {f.name}" for f in files_to_delete), markup=False)
 
     if not yes:
         if not Confirm.ask("\nAre you sure you want to proceed?"):
@@ -252,7 +400,7 @@ def clean(output_dir: str, yes: bool) -> None:
     with console.status(f"Deleting files from [cyan]{output_dir}[/]..."):
         for f in files_to_delete:
             try:
-                f.unlink()
+                os.unlink(f.path)
                 deleted_count += 1
             except OSError as e:
                 console.print(f"[bold red]Error deleting file {f.name}: {e}[/]")
@@ -266,7 +414,7 @@ def clean(output_dir: str, yes: bool) -> None:
 @click.option(
     "--provider",
     required=True,
-    type=click.Choice(["openai", "ollama"], case_sensitive=False),
+    type=_PROVIDER_CHOICE,
     help="The AI provider (Must be defined in pricing.json).",
 )
 @click.option(
@@ -276,7 +424,7 @@ def clean(output_dir: str, yes: bool) -> None:
 )
 @click.option(
     "--mode",
-    type=click.Choice(["rewrite", "inject"], case_sensitive=False),
+    type=_MODE_CHOICE,
     default="rewrite",
     help=(
         "Operation mode. 'rewrite' (Default) regenerates the file."
@@ -294,6 +442,12 @@ def clean(output_dir: str, yes: bool) -> None:
     default=None,
     help="Target a specific function or class for documentation.",
 )
+@click.option(
+    "--cache",
+    is_flag=True,
+    help="Reuse the stored result of an identical earlier run instead of "
+    "calling the model again.",
+)
 def generate(
     filepath: str,
     provider: str,
@@ -303,6 +457,7 @@ def generate(
     check: bool,
     output_dir: str,
     function: Optional[str],
+    cache: bool,
 ) -> None:
     """
     Generate NumPy/Sphinx style docstrings for a Python file via an AI model.
@@ -312,11 +467,12 @@ def generate(
     filepath : str
         Path to the Python file to document.
     provider : str
-        AI provider name (e.g., 'openai', 'ollama').
+        AI provider name (e.g., 'openai', 'ollama'), already lowercased by the
+        option's Choice type.
     model : str
         Model name as configured in pricing.json.
     mode : str
-        Operation mode, either 'rewrite' or 'inject'.
+        Operation mode, either 'rewrite' or 'inject' (lowercased by Click).
     yes : bool
         If True, skip the confirmation prompt and proceed automatically.
     check : bool
@@ -325,6 +481,9 @@ def generate(
         Directory to save output files.
     function : str, optional
         If provided, target a specific function or class within the file.
+    cache : bool
+        If True, reuse the result of an identical earlier request (same file,
+        prompt, mode and model) instead of calling the model.
 
     Examples
     --------
@@ -332,12 +491,17 @@ def generate(
     ai-docify generate src/my_script.py --provider openai --model gpt-5-mini --mode inject
     ai-docify generate src/my_script.py --provider openai --model gpt-5-mini --function my_function
     """
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[logging.StreamHandler(sys.stdout)],
-    )
-    console = Console()
+    # In check mode stdout must carry nothing but the JSON estimate
+    if not check:
+        logging.basicConfig(
+            level=logging.INFO,
+            format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+            handlers=[logging.StreamHandler(sys.stdout)],
+        )
+    from rich.console import Console
+
+    # Check-mode diagnostics go to stderr, leaving stdout to the JSON alone
+    console = Console(stderr=check)
 
     # --- 0. Set effective mode (Safety Check) ---
     effective_mode = mode
@@ -371,8 +535,28 @@ def generate(
             console.print(f"[bold red]Error reading file:[/bold red] {e}")
             sys.exit(1)
 
+        # Nothing to document: skip tokenization and the API call entirely
+        if not original_content.strip():
+            if check:
+                price_info = get_model_price(provider, model)
+                price = price_info.get("input_cost_per_million", 0)
+                empty_estimate = {
+                    "tokens": 0,
+                    "input_cost": 0.0,
+                    "currency": "USD" if price > 0 else "Free/Local",
+                }
+                click.echo(_json_dumps(empty_estimate))
+                sys.exit(0)
+            console.print(f"[yellow]{filepath} is empty. Nothing to document.[/]")
+            return
+
         # --- 3. Cost Estimation (Pre-Flight) ---
+        # The payload is built once here and reused for generation below.
+        payload: Optional[Dict[str, Any]] = None
         try:
+            payload = prepare_llm_payload(
+                original_content, mode=effective_mode, function=function
+            )
             # Pass the selected mode to the estimator
             # so it can account for mode-specific tokens.
             estimates = estimate_cost(
@@ -381,14 +565,19 @@ def generate(
                 model,
                 mode=effective_mode,
                 function=function,
+                payload=payload,
             )
             if check:
                 # Output ONLY pure JSON for the extension to read
-                # We use sys.stdout.write to avoid adding extra newlines or formatting
-                click.echo(json.dumps(estimates))
+                # Bytes go straight to the binary stdout stream, no re-encoding
+                click.echo(_json_dumps(estimates))
                 sys.exit(0)
             print_estimation(console, estimates)
         except Exception as e:
+            if check:
+                # Nothing to fall back to: the estimate is the whole point
+                console.print(f"[bold red]Error: Could not estimate cost: {e}[/]")
+                sys.exit(1)
             console.print(f"[bold yellow]Warning: Could not estimate cost: {e}[/]")
             if not yes:
                 if not prompt_confirmation(console):
@@ -404,7 +593,7 @@ def generate(
         # --- 5. Generate documentation ---
         # Secure API key handling
         api_key = get_api_key(provider)
-        if provider.lower() == "openai" and not api_key:
+        if provider == "openai" and not api_key:
             console.print(
                 "[bold red]Error: OPENAI_API_KEY environment variable is not set.[/]"
             )
@@ -425,6 +614,8 @@ def generate(
                     mode=effective_mode,
                     console=console,
                     function=function,
+                    payload=payload,
+                    cache=cache,
                 )
             except AIDocifyError as e:
                 console.print(f"[bold red]Error generating documentation: {e}[/]")
@@ -432,10 +623,8 @@ def generate(
 
         # --- 6. Write output to output directory ---
         try:
-            path_obj = Path(filepath)
-            output_filename = f"{path_obj.stem}.doc.py"
             output_path = write_output_file(
-                output_dir_path, output_filename, documented_content
+                output_dir_path, output_filename(filepath), documented_content
             )
 
             console.print("\nSuccessfully generated documentation!")
@@ -452,13 +641,250 @@ def generate(
         sys.exit(1)
 
 
+# --- Batch Generate Command ---
+@main.command(name="generate-batch")
+@click.argument(
+    "filepaths",
+    nargs=-1,
+    required=True,
+    type=click.Path(exists=True, dir_okay=False, readable=True),
+)
+@click.option(
+    "--provider",
+    required=True,
+    type=_PROVIDER_CHOICE,
+    help="The AI provider (Must be defined in pricing.json).",
+)
+@click.option(
+    "--model",
+    required=True,
+    help="The specific model name (Must be defined in pricing.json).",
+)
+@click.option(
+    "--mode",
+    type=_MODE_CHOICE,
+    default="rewrite",
+    help="Operation mode, as for 'generate'.",
+)
+@click.option("--yes", "-y", is_flag=True, help="Skip confirmation prompt.")
+@click.option(
+    "--output-dir", default="ai_output", help="Directory to save output files."
+)
+@click.option(
+    "--concurrency",
+    default=4,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Maximum number of files documented in parallel.",
+)
+@click.option(
+    "--cache",
+    is_flag=True,
+    help="Reuse stored results for files unchanged since an identical earlier "
+    "run instead of calling the model again.",
+)
+def generate_batch(
+    filepaths: Tuple[str, ...],
+    provider: str,
+    model: str,
+    mode: str,
+    yes: bool,
+    output_dir: str,
+    concurrency: int,
+    cache: bool,
+) -> None:
+    """
+    Generate docstrings for several Python files in a single run.
+
+    One configuration load, one confirmation and one API client are shared by
+    all files. Up to ``concurrency`` requests are in flight at once; files are
+    submitted in a stable (sorted) order so the shared prompt prefix stays warm
+    in the provider's prompt cache, and results are reported in that order.
+    Files that cannot be read, estimated or documented are reported and
+    skipped without stopping the rest of the batch; empty files are skipped
+    without being estimated, sent or written.
+
+    Parameters
+    ----------
+    filepaths : tuple of str
+        Paths to the Python files to document.
+    provider : str
+        AI provider name (e.g., 'openai', 'ollama').
+    model : str
+        Model name as configured in pricing.json.
+    mode : str
+        Operation mode, either 'rewrite' or 'inject'.
+    yes : bool
+        If True, skip the confirmation prompt and proceed automatically.
+    output_dir : str
+        Directory to save output files.
+    concurrency : int
+        Maximum number of files documented in parallel.
+    cache : bool
+        If True, reuse results of identical earlier requests instead of
+        calling the model for those files.
+
+    Examples
+    --------
+    ai-docify generate-batch src/*.py --provider openai --model gpt-5-mini --mode inject
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        handlers=[logging.StreamHandler(sys.stdout)],
+    )
+    from rich.console import Console
+
+    console = Console()
+
+    if not validate_model(provider, model):
+        console.print(
+            f"[bold red]Error:[/bold red] Model '[cyan]{model}[/]' is not configured "
+            f"for provider '[cyan]{provider}[/]' in your pricing.json."
+        )
+        sys.exit(1)
+
+    api_key = get_api_key(provider)
+    if provider == "openai" and not api_key:
+        console.print(
+            "[bold red]Error: OPENAI_API_KEY environment variable is not set.[/]"
+        )
+        sys.exit(1)
+
+    # --- 1. Read files and estimate the total cost up front ---
+    unique_paths = sorted(dict.fromkeys(filepaths))
+
+    # Outputs are named after the file stem, so files sharing one (a/x.py and
+    # b/x.py) would overwrite each other; refuse before spending anything
+    paths_by_output: Dict[str, List[str]] = {}
+    for filepath in unique_paths:
+        paths_by_output.setdefault(output_filename(filepath), []).append(filepath)
+    clashes = {name: paths for name, paths in paths_by_output.items() if len(paths) > 1}
+    if clashes:
+        for name, paths in clashes.items():
+            console.print(
+                f"[bold red]Error:[/bold red] {', '.join(paths)} would all be "
+                f"saved as {name}."
+            )
+        console.print("Document files that share a name in separate runs.")
+        sys.exit(1)
+
+    sources: Dict[str, str] = {}
+    payloads: Dict[str, Dict[str, Any]] = {}
+    total_estimate: Dict[str, Any] = {"tokens": 0, "input_cost": 0.0}
+    failures = 0
+    skipped = 0
+    for filepath in unique_paths:
+        # A file that cannot be read or estimated is reported and skipped
+        try:
+            source = read_file(filepath)
+            # Nothing to document: no estimate, no API call and no output file
+            if not source.strip():
+                skipped += 1
+                console.print(f"[yellow]{filepath} is empty. Nothing to document.[/]")
+                continue
+            payload = prepare_llm_payload(source, mode=mode)
+            estimates = estimate_cost(
+                source, provider, model, mode=mode, payload=payload
+            )
+        except Exception as e:
+            failures += 1
+            console.print(f"[bold red]Error preparing {filepath}: {e}[/]")
+            continue
+        sources[filepath] = source
+        payloads[filepath] = payload
+        total_estimate["tokens"] += estimates["tokens"]
+        total_estimate["input_cost"] += estimates["input_cost"]
+        total_estimate["currency"] = estimates["currency"]
+
+    if not sources:
+        if not failures:
+            # Every file was empty, which is not an error for `generate` either
+            return
+        console.print("[bold red]No files left to document.[/]")
+        sys.exit(1)
+
+    console.print(
+        f"[bold green][AI] ai-docify[/]: Checking [cyan]{len(sources)}[/] file(s)"
+        f" in [yellow]{mode.upper()}[/] mode"
+    )
+    print_estimation(console, total_estimate)
+
+    if not yes and not prompt_confirmation(console):
+        console.print("[yellow]Aborted by user.[/]")
+        return
+
+    # --- 2. Generate each file with a shared client ---
+    try:
+        client = create_client(provider, api_key)
+    except AIDocifyError as e:
+        console.print(f"[bold red]Error generating documentation: {e}[/]")
+        sys.exit(1)
+
+    output_dir_path = Path(output_dir)
+
+    def document_file(filepath: str) -> Tuple[Path, Dict[str, int]]:
+        # Network-bound, so worker threads overlap the API round-trips
+        documented_content, usage_stats = generate_documentation(
+            file_content=sources[filepath],
+            provider=provider,
+            model=model,
+            api_key=api_key,
+            mode=mode,
+            payload=payloads[filepath],
+            client=client,
+            cache=cache,
+        )
+        output_path = write_output_file(
+            output_dir_path, output_filename(filepath), documented_content
+        )
+        return output_path, usage_stats
+
+    total_usage: Dict[str, int] = {}
+    with console.status(
+        f"Generating docs for [cyan]{len(sources)}[/] file(s) using [cyan]{model}[/]...",
+        spinner="dots",
+    ), ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {
+            filepath: pool.submit(document_file, filepath) for filepath in sources
+        }
+        try:
+            for filepath, future in futures.items():
+                try:
+                    output_path, usage_stats = future.result()
+                except (AIDocifyError, IOError) as e:
+                    failures += 1
+                    console.print(f"[bold red]Error documenting {filepath}: {e}[/]")
+                    continue
+
+                for key, value in usage_stats.items():
+                    total_usage[key] = total_usage.get(key, 0) + value
+                console.print(f"   Output saved to: [bold yellow]{output_path}[/]")
+        except BaseException:
+            # On Ctrl-C (or any abort) the pool's exit would still wait for every
+            # queued file; drop those so no further requests are sent. Requests
+            # already in flight cannot be recalled and are left to finish.
+            for future in futures.values():
+                future.cancel()
+            raise
+
+    # --- 3. Aggregated Usage Report ---
+    console.print(
+        f"\nDocumented [bold green]{len(unique_paths) - failures - skipped}[/] of "
+        f"[cyan]{len(unique_paths)}[/] file(s)."
+    )
+    print_final_usage_report(console, total_usage, provider, model)
+    if failures:
+        sys.exit(1)
+
+
 # --- Config Command (For VS Code) ---
 @main.command(name="config")
 def config_dump() -> None:
     """Print the loaded pricing configuration as JSON."""
     # Load and dump to stdout for the extension to read
     cfg = load_config()
-    click.echo(json.dumps(cfg))
+    click.echo(_json_dumps(cfg))
 
 
 # --- Strip Command ---
@@ -473,6 +899,10 @@ def strip(filepath: str) -> None:
     filepath : str
         Path to the file to process.
     """
+    from rich.console import Console
+
+    from .stripper import strip_docstrings
+
     console = Console()
     stripped_output_dir = Path("stripped_scripts")
 
@@ -480,10 +910,10 @@ def strip(filepath: str) -> None:
         original_content = read_file(filepath)
         stripped_content = strip_docstrings(original_content)
 
-        path_obj = Path(filepath)
-        output_filename = f"{path_obj.stem}_strip.py"
+        stem = os.path.splitext(os.path.basename(filepath))[0]
+        stripped_filename = f"{stem}_strip.py"
         output_path = write_output_file(
-            stripped_output_dir, output_filename, stripped_content
+            stripped_output_dir, stripped_filename, stripped_content
         )
 
         console.print(f"✅ Successfully stripped docstrings from [cyan]{filepath}[/]")
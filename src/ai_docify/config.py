@@ -7,19 +7,25 @@ is defined, and to retrieve pricing details for a specific model.
 """
 
 # --- Imports ---
-import json
+import functools
 import logging
-from pathlib import Path
+import os
+
+from ._json import loads as _json_loads
 
 # --- Module-level Constants ---
 # Pricing file is expected to be adjacent to this file
-CONFIG_PATH = Path(__file__).parent / "pricing.json"
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pricing.json")
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_CONFIG = {
     "openai": {
-        "gpt-5-mini": {"input_cost_per_million": 0.25, "output_cost_per_million": 2.0}
+        "gpt-5-mini": {
+            "input_cost_per_million": 0.25,
+            "cached_input_cost_per_million": 0.025,
+            "output_cost_per_million": 2.0,
+        }
     },
     "ollama": {
         "llama3.1:8b": {"input_cost_per_million": 0.0, "output_cost_per_million": 0.0}
@@ -29,22 +35,43 @@ DEFAULT_CONFIG = {
 # --- Helper Functions ---
 
 
+@functools.lru_cache(maxsize=1)
 def load_config() -> dict:
     """
     Load configuration from pricing.json.
-    """
-    if not CONFIG_PATH.exists():
-        return DEFAULT_CONFIG
 
+    The result is cached for the lifetime of the process and must be treated
+    as read-only by callers.
+    """
     try:
-        with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
+        # Read raw bytes; both decoders handle UTF-8 themselves
+        with open(CONFIG_PATH, "rb") as f:
+            return _json_loads(f.read())
+    except FileNotFoundError:
+        # No pricing file shipped or installed: the defaults are expected here
+        return DEFAULT_CONFIG
     except Exception as e:
         # Log the error and fall back to defaults
         logger.error("Error loading configuration: %s", e)
         return DEFAULT_CONFIG
 
 
+def cache_dir() -> str:
+    """
+    Return the directory for ai-docify's on-disk caches.
+
+    Returns
+    -------
+    str
+        ``ai-docify`` under ``$XDG_CACHE_HOME`` (default ``~/.cache``). The
+        directory is not created here.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "ai-docify")
+
+
 def validate_model(provider: str, model: str) -> bool:
     """
     Check if a model is defined in the configuration.
@@ -6,22 +6,37 @@ interaction, and post-processing including injecting generated
 docstrings back into source.
 """
 
+import functools
+import hashlib
 import json
 import logging
-from pathlib import Path
-from typing import Tuple, Dict, Any, Optional
-from openai import OpenAI, OpenAIError
-from rich.console import Console
+import os
+import threading
+from typing import TYPE_CHECKING, Tuple, Dict, Any, Optional
 import ast
 
 # Internal imports
+from ._json import loads as _json_loads
+from .config import cache_dir
 from .tools import insert_docstrings_to_source
 
+if TYPE_CHECKING:
+    from rich.console import Console
+
 # --- Logger Setup ---
 logger = logging.getLogger(__name__)
 
 
 # --- Constants & Schemas ---
+# Prompt template is expected in the templates/ directory adjacent to this file
+TEMPLATE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "templates", "docstring_generator.json"
+)
+
+# Markdown fences models sometimes wrap rewrite-mode output in
+_FENCE_OPEN = "```python"
+_FENCE_CLOSE = "```"
+
 DOCSTRING_TOOL_SCHEMA = [
     {
         "type": "function",
@@ -61,21 +76,80 @@ class AIDocifyError(Exception):
 
 
 # --- Helper Functions ---
+# Parsed template plus derived prompts, keyed on the template file's stat identity
+_template_cache: Dict[str, Any] = {"key": None, "template": None, "prompts": {}}
+
+
 def _load_template() -> dict:
     """
     Load the JSON prompt template from disk.
 
+    The parsed template is cached and only re-read when the file's inode,
+    modification time or size changes. Callers must treat it as read-only.
+
     Returns
     -------
     dict
         The loaded JSON template as a dictionary.
     """
-    template_path = Path(__file__).parent / "templates" / "docstring_generator.json"
-    if not template_path.exists():
-        raise FileNotFoundError(f"Template not found at: {template_path}")
+    try:
+        st = os.stat(TEMPLATE_PATH)
+        key = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if key != _template_cache["key"]:
+            # Read raw bytes; both decoders handle UTF-8 themselves
+            with open(TEMPLATE_PATH, "rb") as f:
+                template = _json_loads(f.read())
+            _template_cache.update(key=key, template=template, prompts={})
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"Template not found at: {TEMPLATE_PATH}") from e
+    return _template_cache["template"]
+
+
+def _get_prompts(mode: str) -> Tuple[str, str, str]:
+    """
+    Get the system prompt and the split user prompt for a mode.
+
+    Parameters
+    ----------
+    mode : str
+        Mode whose prompts should be returned; unknown modes fall back to
+        "rewrite".
 
-    with open(template_path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    Returns
+    -------
+    Tuple[str, str, str]
+        The system prompt, followed by the (prefix, suffix) text surrounding
+        the ``{raw_text}`` placeholder of the user prompt.
+    """
+    template = _load_template()
+    prompts = _template_cache["prompts"]
+    if mode not in prompts:
+        prompt_details = template.get(mode, template.get("rewrite"))
+        prefix, _, suffix = prompt_details["user_prompt"].partition("{raw_text}")
+        prompts[mode] = (prompt_details["system_prompt"], prefix, suffix)
+    return prompts[mode]
+
+
+def _usage_detail(details: Any, key: str) -> int:
+    """
+    Read one token count from a usage details block.
+
+    Parameters
+    ----------
+    details : Any
+        A ``*_tokens_details`` value from the API usage; providers return it
+        as an object, a dict, or not at all.
+    key : str
+        The count to read (e.g. "reasoning_tokens").
+
+    Returns
+    -------
+    int
+        The count, or 0 when the block or key is missing or null.
+    """
+    if isinstance(details, dict):
+        return details.get(key) or 0
+    return getattr(details, key, None) or 0
 
 
 # --- Payload Construction ---
@@ -101,11 +175,7 @@ def prepare_llm_payload(
         A payload dictionary containing the messages and, for "inject"
         mode, a tools schema.
     """
-    template = _load_template()
-    prompt_details = template.get(mode, template.get("rewrite"))
-
-    system_prompt = prompt_details["system_prompt"]
-    user_prompt_template = prompt_details["user_prompt"]
+    system_prompt, prefix, suffix = _get_prompts(mode)
 
     source_for_llm = file_content
     if function:
@@ -134,7 +204,8 @@ def prepare_llm_payload(
                 f"Failed to parse AST for function '{function}': {e}. Falling back to full file."
             )
 
-    user_prompt = user_prompt_template.format(raw_text=source_for_llm)
+    # Plain concatenation avoids re-parsing the template with str.format
+    user_prompt = prefix + source_for_llm + suffix
 
     messages = [
         {"role": "system", "content": system_prompt},
@@ -149,6 +220,169 @@ def prepare_llm_payload(
     return payload
 
 
+# --- Client Construction ---
+@functools.lru_cache(maxsize=8)
+def create_client(provider: str, api_key: Optional[str]) -> Any:
+    """
+    Create an OpenAI-compatible client for the given provider.
+
+    Clients are cached per (provider, api_key) so repeated calls share one
+    HTTP connection pool. Call ``create_client.cache_clear()`` after rotating
+    an API key to drop clients built with the old one.
+
+    Parameters
+    ----------
+    provider : str
+        The backend provider identifier (e.g., "openai" or "ollama").
+    api_key : str | None
+        API key for authentication with the provider (required for
+        OpenAI).
+
+    Returns
+    -------
+    openai.OpenAI
+        A client that can be reused across several generate_documentation
+        calls. The same instance is returned for the same arguments.
+    """
+    # Imported lazily: the OpenAI SDK dominates CLI start-up time
+    from openai import OpenAI
+
+    if provider == "ollama":
+        logger.info("Connecting to local Ollama")
+        return OpenAI(base_url="http://localhost:11434/v1", api_key="ollama")
+
+    if not api_key:
+        raise AIDocifyError("API key is required for OpenAI")
+    logger.info("Connecting to OpenAI")
+    return OpenAI(api_key=api_key)
+
+
+# --- Response Cache ---
+# Each entry is a whole documented file; beyond this many the least recently
+# used entries are removed
+_RESPONSE_CACHE_MAX_ENTRIES = 256
+
+
+def _response_cache_path(
+    provider: str, model: str, payload: Dict[str, Any], file_content: str
+) -> str:
+    """
+    Return the cache file for a request.
+
+    The key covers everything sent to the model (prompts, source and tool
+    schema) plus the whole file, so any change to the file, template, mode or
+    model misses. The file matters on its own because with ``--function`` the
+    payload holds only the target's source, while the cached result is the
+    whole documented file.
+
+    Parameters
+    ----------
+    provider : str
+        The backend provider identifier.
+    model : str
+        The model name the request is sent to.
+    payload : Dict[str, Any]
+        The payload built by prepare_llm_payload.
+    file_content : str
+        The full source of the file being documented.
+
+    Returns
+    -------
+    str
+        Path of the JSON file holding the cached result.
+    """
+    request = json.dumps([provider, model, payload, file_content], sort_keys=True)
+    key = hashlib.blake2b(request.encode("utf-8"), digest_size=16).hexdigest()
+    return os.path.join(cache_dir(), "responses", f"{key}.json")
+
+
+def _read_cached_response(path: str) -> Optional[str]:
+    """
+    Read a cached result, or None if there is no usable entry.
+
+    Parameters
+    ----------
+    path : str
+        Path returned by _response_cache_path.
+
+    Returns
+    -------
+    str | None
+        The cached documented source.
+    """
+    try:
+        with open(path, "rb") as f:
+            result = _json_loads(f.read()).get("result")
+    except (OSError, ValueError, AttributeError):
+        return None
+    if not isinstance(result, str):
+        return None
+    try:
+        # Mark the entry as recently used so pruning keeps it
+        os.utime(path)
+    except OSError:
+        pass
+    return result
+
+
+def _prune_cached_responses(directory: str) -> None:
+    """
+    Remove the least recently used entries beyond the cache's size limit.
+
+    Parameters
+    ----------
+    directory : str
+        The directory holding the cached responses.
+    """
+    try:
+        with os.scandir(directory) as it:
+            entries = [
+                (e.stat().st_mtime_ns, e.path)
+                for e in it
+                if e.name.endswith(".json") and e.is_file()
+            ]
+    except OSError:
+        return
+    excess = len(entries) - _RESPONSE_CACHE_MAX_ENTRIES
+    if excess <= 0:
+        return
+    entries.sort()
+    for _, path in entries[:excess]:
+        try:
+            os.unlink(path)
+        except OSError:
+            # Already removed by a concurrent run
+            pass
+
+
+def _write_cached_response(path: str, result: str) -> None:
+    """
+    Store a result in the response cache and prune it; failures are only logged.
+
+    Parameters
+    ----------
+    path : str
+        Path returned by _response_cache_path.
+    result : str
+        The documented source to cache.
+    """
+    # Unique per thread too: generate-batch workers may write the same entry
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"result": result}, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("Could not cache the response: %s", e)
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        return
+    _prune_cached_responses(os.path.dirname(path))
+
+
 # --- Public API ---
 def generate_documentation(
     file_content: str,
@@ -156,8 +390,11 @@ def generate_documentation(
     model: str,
     api_key: str | None,
     mode: str = "rewrite",
-    console: Optional[Console] = None,
+    console: Optional["Console"] = None,
     function: Optional[str] = None,
+    payload: Optional[Dict[str, Any]] = None,
+    client: Optional[Any] = None,
+    cache: bool = False,
 ) -> Tuple[str, Dict[str, Any]]:
     """
     Generate documentation for Python source.
@@ -178,50 +415,80 @@ def generate_documentation(
         "inject" returns the original source with docstrings injected
         (default "rewrite").
     console : Optional[Console], optional
-        Optional Rich Console for user-facing messages (default creates a
-        new Console).
+        Optional Rich Console for user-facing progress messages. When omitted
+        nothing is printed; progress is still logged.
     function : str, optional
         If provided, target a specific function or class within the file.
+    payload : Dict[str, Any], optional
+        A payload already built by prepare_llm_payload (e.g. during cost
+        estimation). When provided it is sent as-is instead of being rebuilt.
+    client : openai.OpenAI, optional
+        A client from create_client to reuse (e.g. across a batch of files).
+        When omitted, the cached client from create_client is used.
+    cache : bool, optional
+        If True, return the stored result of an identical earlier request
+        without calling the model (reported usage is then all zeros), and
+        store new results for reuse (default False).
 
     Returns
     -------
     Tuple[str, Dict[str, Any]]
         A tuple of (resulting_source_or_text, usage_stats) where usage_stats
         is a mapping containing token usage keys ("input_tokens",
-        "output_tokens", "reasoning_tokens").
+        "output_tokens", "reasoning_tokens", "cached_input_tokens").
     """
-    if console is None:
-        console = Console()
+    # Imported lazily: the OpenAI SDK dominates CLI start-up time
+    from openai import OpenAIError
 
     # Initialize empty usage stats
     usage: Dict[str, int] = {
         "input_tokens": 0,
         "output_tokens": 0,
         "reasoning_tokens": 0,
+        "cached_input_tokens": 0,
     }
 
+    # Nothing to document: an empty file is returned as-is without an API call
+    if not file_content.strip():
+        logger.info("Skipping empty source; nothing to document")
+        return file_content, usage
+
     try:
-        # 1. Initialize Client
-        if provider == "ollama":
-            client = OpenAI(base_url="http://localhost:11434/v1", api_key="ollama")
-            logger.info("Connecting to local Ollama with model %s", model)
-        else:
-            if not api_key:
-                raise AIDocifyError("API key is required for OpenAI")
-            client = OpenAI(api_key=api_key)
-            logger.info("Connecting to OpenAI with model %s", model)
-
-        # 2. Prepare Payload (Centralized Logic)
-        try:
-            payload = prepare_llm_payload(file_content, mode=mode, function=function)
-        except Exception as e:
-            raise AIDocifyError(f"Error building messages: {e}") from e
+        # 1. Prepare Payload (Centralized Logic), unless the caller already did
+        if payload is None:
+            try:
+                payload = prepare_llm_payload(
+                    file_content, mode=mode, function=function
+                )
+            except Exception as e:
+                raise AIDocifyError(f"Error building messages: {e}") from e
+
+        # An identical earlier request needs no client or API call at all
+        cache_path = None
+        if cache:
+            cache_path = _response_cache_path(provider, model, payload, file_content)
+            cached_result = _read_cached_response(cache_path)
+            if cached_result is not None:
+                logger.info("Reusing cached result for %s (%s mode)", model, mode)
+                if console is not None:
+                    console.print("Reusing cached result (no API call).")
+                return cached_result, usage
+
+        # 2. Initialize Client (unless the caller is reusing one)
+        if client is None:
+            client = create_client(provider, api_key)
 
         # 3. Call API
         kwargs = {"model": model, **payload}
 
-        logger.info("Generating documentation (%s mode)", mode)
-        console.print(f"Generating documentation ({mode} mode)...")
+        logger.info("Generating documentation with %s (%s mode)", model, mode)
+        if console is not None:
+            # Plain text: no markup to parse or highlight
+            console.print(
+                f"Generating documentation ({mode} mode)...",
+                markup=False,
+                highlight=False,
+            )
 
         try:
             response = client.chat.completions.create(**kwargs)
@@ -232,14 +499,15 @@ def generate_documentation(
         if response.usage:
             usage["input_tokens"] = response.usage.prompt_tokens
             usage["output_tokens"] = response.usage.completion_tokens
-            # Handle varied shapes of completion_tokens_details (may be dict or object)
-            if hasattr(response.usage, "completion_tokens_details"):
-                details = response.usage.completion_tokens_details
-                # If dict-like, pull reasoning_tokens key; otherwise, use attribute access
-                if isinstance(details, dict):
-                    usage["reasoning_tokens"] = details.get("reasoning_tokens", 0)
-                else:
-                    usage["reasoning_tokens"] = getattr(details, "reasoning_tokens", 0)
+            usage["reasoning_tokens"] = _usage_detail(
+                getattr(response.usage, "completion_tokens_details", None),
+                "reasoning_tokens",
+            )
+            # Prompt tokens served from the provider's prompt cache
+            usage["cached_input_tokens"] = _usage_detail(
+                getattr(response.usage, "prompt_tokens_details", None),
+                "cached_tokens",
+            )
 
         # 5. Process Response
         if mode == "rewrite":
@@ -247,14 +515,24 @@ def generate_documentation(
             if not content:
                 raise AIDocifyError("Invalid API response: missing content")
 
-            # Strip markdown fences if the model wrapped the code block
-            if content.startswith("```python"):
-                content = content[
-                    9:
-                ].lstrip()  # remove the opening triple-backticks and language tag
-            if content.endswith("```"):
-                content = content[:-3].rstrip()  # remove closing triple-backticks
-
+            # Strip markdown fences if the model wrapped the code block.
+            # Bounds are found first so the (possibly large) text is copied once.
+            start, end = 0, len(content)
+            if content.startswith(_FENCE_OPEN):
+                # skip the opening triple-backticks, language tag and whitespace
+                start = len(_FENCE_OPEN)
+                while start < end and content[start].isspace():
+                    start += 1
+            if content.endswith(_FENCE_CLOSE) and end - len(_FENCE_CLOSE) >= start:
+                # drop the closing triple-backticks and whitespace before them
+                end -= len(_FENCE_CLOSE)
+                while end > start and content[end - 1].isspace():
+                    end -= 1
+            if start or end < len(content):
+                content = content[start:end]
+
+            if cache_path:
+                _write_cached_response(cache_path, content)
             return content, usage
 
         elif mode == "inject":
@@ -263,9 +541,15 @@ def generate_documentation(
                 raise AIDocifyError("Model did not return any valid tool calls")
 
             docstring_map: Dict[str, str] = {}
+            # Models sometimes repeat a call verbatim; decode each payload once
+            seen_arguments = set()
             for tool_call in msg.tool_calls:
                 if tool_call.function.name == "generate_one_docstring":
-                    args = json.loads(tool_call.function.arguments)
+                    arguments = tool_call.function.arguments
+                    if arguments in seen_arguments:
+                        continue
+                    seen_arguments.add(arguments)
+                    args = _json_loads(arguments)
                     if args.get("name") and args.get("body"):
                         docstring_map[args["name"]] = args["body"]
 
@@ -273,6 +557,8 @@ def generate_documentation(
                 raise AIDocifyError("No valid docstrings were generated")
 
             final_code = insert_docstrings_to_source(file_content, docstring_map)
+            if cache_path:
+                _write_cached_response(cache_path, final_code)
             return final_code, usage
 
     except Exception as e:
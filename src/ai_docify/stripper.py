@@ -6,7 +6,12 @@ to obtain code with docstrings stripped.
 """
 
 import ast
-import astunparse
+
+try:
+    # Python 3.9+: the stdlib unparser understands all current syntax
+    _unparse = ast.unparse
+except AttributeError:  # pragma: no cover - Python 3.8 only
+    from astunparse import unparse as _unparse
 
 
 class DocstringStripper(ast.NodeTransformer):
@@ -29,7 +34,8 @@ class DocstringStripper(ast.NodeTransformer):
         node : ast.AST
             An AST node that has a body attribute (for example, Module, FunctionDef,
             or ClassDef). If the first statement in node.body is an Expr node whose
-            value is a string constant, that statement will be removed.
+            value is a string constant, that statement will be removed; a body
+            left empty (other than a module's) is given a ``pass`` statement.
 
         Returns
         -------
@@ -42,7 +48,10 @@ class DocstringStripper(ast.NodeTransformer):
             if isinstance(expr_value, ast.Constant) and isinstance(
                 expr_value.value, str
             ):
-                node.body = node.body[1:]
+                # A docstring-only function or class still needs a statement
+                node.body = node.body[1:] or (
+                    [] if isinstance(node, ast.Module) else [ast.Pass()]
+                )
         return node
 
     def visit_Module(self, node):
@@ -147,4 +156,4 @@ def strip_docstrings(source_code: str) -> str:
     tree = ast.parse(source_code)
     stripper = DocstringStripper()
     stripped_tree = stripper.visit(tree)
-    return astunparse.unparse(stripped_tree)
+    return _unparse(stripped_tree)
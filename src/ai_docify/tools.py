@@ -8,7 +8,8 @@ based on a provided mapping of symbol names to docstring text.
 """
 
 import ast
-from typing import Dict, List, Set, Tuple
+from collections import defaultdict
+from typing import Dict, Iterator, List, Set, Tuple
 
 
 # --- Helper Functions ---
@@ -29,24 +30,53 @@ def _clean_docstring(raw_text: str, indent_level: int) -> str:
         The cleaned and properly indented docstring including triple quotes
         and trailing newline.
     """
-    indent = " " * indent_level
     cleaned = raw_text.strip()
 
     # Remove surrounding triple quotes if present (LLM outputs etc.)
-    if cleaned.startswith('"""') and cleaned.endswith('"""') and len(cleaned) >= 6:
-        cleaned = cleaned[3:-3].strip()
-    elif cleaned.startswith("'''") and cleaned.endswith("'''") and len(cleaned) >= 6:
+    if (
+        len(cleaned) >= 6
+        and cleaned[:3] in ('"""', "'''")
+        and cleaned.endswith(cleaned[:3])
+    ):
         cleaned = cleaned[3:-3].strip()
 
-    formatted_lines: List[str] = [f'{indent}"""']
-    for line in cleaned.split("\n"):
-        if line.strip():
-            formatted_lines.append(f"{indent}{line}")
-        else:
-            formatted_lines.append("")  # preserve blank line inside docstring
-    formatted_lines.append(f'{indent}"""')
-    # Join with newline and ensure final newline
-    return "\n".join(formatted_lines) + "\n"
+    indent = " " * indent_level
+    # Indent content lines; blank lines inside the docstring stay empty
+    body = "\n".join(
+        f"{indent}{line}" if line.strip() else "" for line in cleaned.split("\n")
+    )
+    return f'{indent}"""\n{body}\n{indent}"""\n'
+
+
+def _iter_definitions(
+    statements: List[ast.stmt], target_types: Tuple[type, ...]
+) -> Iterator[ast.AST]:
+    """
+    Yield definitions of the given types nested anywhere in a statement list.
+
+    Only statement blocks are searched (bodies, ``else``/``finally`` blocks,
+    exception handlers and ``match`` cases), since that is the only place a
+    definition can appear. This visits far fewer nodes than ``ast.walk``.
+
+    Parameters
+    ----------
+    statements : List[ast.stmt]
+        The statement list to search, e.g. ``tree.body``.
+    target_types : Tuple[type, ...]
+        The node types to yield.
+
+    Yields
+    ------
+    ast.AST
+        Each matching definition, parents before the definitions they contain.
+    """
+    for node in statements:
+        if isinstance(node, target_types):
+            yield node
+        for field in ("body", "orelse", "finalbody", "handlers", "cases"):
+            block = getattr(node, field, None)
+            if block:
+                yield from _iter_definitions(block, target_types)
 
 
 # --- Main API ---
@@ -72,9 +102,16 @@ def insert_docstrings_to_source(
         original source cannot be parsed due to a SyntaxError, the original
         source string is returned unchanged.
     """
+    # Nothing to do unless a module docstring or a name present in the source
+    # is requested; every definition spells its name out literally.
+    if "__module__" not in docstring_map and not any(
+        name in original_source for name in docstring_map
+    ):
+        return original_source
+
     lines: List[str] = original_source.splitlines(keepends=True)
     try:
-        tree = ast.parse("".join(lines))
+        tree = ast.parse(original_source)
     except SyntaxError:
         return original_source
 
@@ -99,38 +136,40 @@ def insert_docstrings_to_source(
     # --- Symbol docstrings (Functions & Classes) ---
     target_types = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
 
-    for node in ast.walk(tree):
-        if isinstance(node, target_types):
-            if node.name in docstring_map:
-                # Detect & mark existing docstring if present
-                if (
-                    node.body
-                    and isinstance(node.body[0], ast.Expr)
-                    and isinstance(node.body[0].value, ast.Constant)
-                ):
-                    old_doc = node.body[0]
-                    for i in range(old_doc.lineno - 1, old_doc.end_lineno):
-                        lines_to_delete.add(i)
-
-                # Standard indent: node.col_offset + 4 (covers methods inside classes)
-                indent_level = node.col_offset + 4
-                new_doc = _clean_docstring(docstring_map[node.name], indent_level)
-
-                # Insert at the line index of the first statement in the body
-                insertion_index = node.body[0].lineno - 1
-                insertions.append((insertion_index, new_doc))
+    for node in _iter_definitions(tree.body, target_types):
+        if node.name in docstring_map:
+            # Detect & mark existing docstring if present
+            if (
+                node.body
+                and isinstance(node.body[0], ast.Expr)
+                and isinstance(node.body[0].value, ast.Constant)
+            ):
+                old_doc = node.body[0]
+                for i in range(old_doc.lineno - 1, old_doc.end_lineno):
+                    lines_to_delete.add(i)
+
+            # Standard indent: node.col_offset + 4 (covers methods inside classes)
+            indent_level = node.col_offset + 4
+            new_doc = _clean_docstring(docstring_map[node.name], indent_level)
+
+            # Insert at the line index of the first statement in the body
+            insertion_index = node.body[0].lineno - 1
+            insertions.append((insertion_index, new_doc))
 
     # --- Execute changes ---
-    for idx in lines_to_delete:
-        if 0 <= idx < len(lines):
-            lines[idx] = None
-
-    # Sort insertions in reverse order to avoid shifting indices while inserting
-    insertions.sort(key=lambda x: x[0], reverse=True)
-
+    # Group insertions by line so the output is built in one pass; texts
+    # sharing a line keep the order the previous reverse-insert produced.
+    insertions_at: Dict[int, List[str]] = defaultdict(list)
     for idx, text in insertions:
         if 0 <= idx <= len(lines):
-            lines.insert(idx, text)
+            insertions_at[idx].insert(0, text)
+
+    output: List[str] = []
+    for idx, line in enumerate(lines):
+        if idx in insertions_at:
+            output.extend(insertions_at[idx])
+        if idx not in lines_to_delete:
+            output.append(line)
+    output.extend(insertions_at.get(len(lines), ()))
 
-    # Reconstruct source skipping removed lines
-    return "".join([line for line in lines if line is not None])
+    return "".join(output)
@@ -8,15 +8,22 @@ estimates match the actual generation behavior.
 """
 
 from __future__ import annotations
+import atexit
+import functools
+import hashlib
 import json
+import os
 from typing import Any, Dict, Optional
 import tiktoken
-from .config import get_model_price
-from .generator import prepare_llm_payload
+from .config import cache_dir, get_model_price
+from .generator import DOCSTRING_TOOL_SCHEMA, prepare_llm_payload
 
 
 # --- Helper Functions ------------------------------------------------------
 
+# The inject-mode tool schema is a constant, so serialize it once
+_TOOL_SCHEMA_JSON = json.dumps(DOCSTRING_TOOL_SCHEMA)
+
 
 def calculate_token_cost(tokens: int, price_per_million: float) -> float:
     """
@@ -39,6 +46,141 @@ def calculate_token_cost(tokens: int, price_per_million: float) -> float:
     return (tokens / 1_000_000) * price_per_million
 
 
+# --- Token Count Cache ----------------------------------------------------
+
+# Token counts persist across processes, so repeated `--check` runs on an
+# unchanged file skip loading the tokenizer entirely. New counts are written
+# back once, when the process exits.
+_TOKEN_CACHE_MAX_ENTRIES = 512
+_token_counts: Optional[Dict[str, int]] = None
+_token_counts_dirty = False
+
+
+def _token_cache_path() -> str:
+    """
+    Return the path of the on-disk token count cache.
+
+    Returns
+    -------
+    str
+        ``token_counts.json`` inside the ai-docify cache directory.
+    """
+    return os.path.join(cache_dir(), "token_counts.json")
+
+
+def _load_token_counts() -> Dict[str, int]:
+    """
+    Load the token count cache, reading it from disk on first use.
+
+    Returns
+    -------
+    Dict[str, int]
+        Mapping of content keys to token counts; empty if the cache file is
+        missing or unreadable.
+    """
+    global _token_counts
+    if _token_counts is None:
+        try:
+            with open(_token_cache_path(), "rb") as f:
+                data = json.loads(f.read())
+            # Keep only well-formed entries; anything else is simply recounted
+            _token_counts = (
+                {k: v for k, v in data.items() if type(v) is int and v >= 0}
+                if isinstance(data, dict)
+                else {}
+            )
+        except (OSError, ValueError):
+            _token_counts = {}
+    return _token_counts
+
+
+def _save_token_counts() -> None:
+    """
+    Persist the token count cache if it changed, evicting the least recently
+    used entries.
+
+    Registered with atexit on the first cache update, so the file is written
+    at most once per process. Failures are ignored: the cache only ever saves work.
+    """
+    global _token_counts_dirty
+    counts = _token_counts
+    if not _token_counts_dirty or counts is None:
+        return
+    _token_counts_dirty = False
+
+    # Hits move their key to the end, so the first keys are the least recently used
+    while len(counts) > _TOKEN_CACHE_MAX_ENTRIES:
+        del counts[next(iter(counts))]
+
+    path = _token_cache_path()
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(counts, f)
+        # Atomic swap so concurrent runs never read a partial file
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+@functools.lru_cache(maxsize=32)
+def _get_encoding(model: str) -> tiktoken.Encoding:
+    """
+    Return the tiktoken encoding for a model, memoized per model name.
+
+    Parameters
+    ----------
+    model : str
+        The model identifier used to select the tokenizer/encoding.
+
+    Returns
+    -------
+    tiktoken.Encoding
+        The model's encoding, or ``cl100k_base`` for unknown models.
+    """
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # Fallback to a sensible default encoding when model-specific one is missing
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text: str, model: str) -> int:
+    """
+    Count the tokens in a text with the model's tokenizer, using the cache.
+
+    Parameters
+    ----------
+    text : str
+        The text to tokenize.
+    model : str
+        The model identifier used to select the tokenizer/encoding.
+
+    Returns
+    -------
+    int
+        Number of tokens in ``text``.
+    """
+    global _token_counts_dirty
+    key = hashlib.blake2b(
+        f"{model}\0{text}".encode("utf-8"), digest_size=16
+    ).hexdigest()
+    counts = _load_token_counts()
+    if key in counts:
+        # Re-insert so eviction drops the least recently used counts first
+        count = counts[key] = counts.pop(key)
+    else:
+        # Source files are plain text: skip the special-token scan, which would
+        # also raise on files that happen to contain markers like "<|endoftext|>"
+        count = len(_get_encoding(model).encode_ordinary(text))
+        counts[key] = count
+    if not _token_counts_dirty:
+        _token_counts_dirty = True
+        atexit.register(_save_token_counts)
+    return count
+
+
 # --- Cost Estimation ------------------------------------------------------
 
 
@@ -48,6 +190,7 @@ def estimate_cost(
     model: str,
     mode: str = "rewrite",
     function: Optional[str] = None,
+    payload: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """
     Estimate token count and cost using the exact payload logic used for generation.
@@ -64,6 +207,9 @@ def estimate_cost(
         Mode passed to the payload preparer (e.g., "rewrite", "summarize").
     function : str, optional
         The specific function being targeted, if any.
+    payload : Dict[str, Any], optional
+        A payload already built by prepare_llm_payload for the same arguments.
+        When provided it is reused instead of being rebuilt.
 
     Returns
     -------
@@ -75,8 +221,9 @@ def estimate_cost(
     """
     price_info = get_model_price(provider, model)
 
-    # 1. Get the authoritative payload from generator
-    payload = prepare_llm_payload(file_content, mode=mode, function=function)
+    # 1. Get the authoritative payload from generator (unless supplied)
+    if payload is None:
+        payload = prepare_llm_payload(file_content, mode=mode, function=function)
 
     messages = payload.get("messages", [])
     tools = payload.get("tools")
@@ -87,19 +234,15 @@ def estimate_cost(
 
     # Append tool schema if present (serialize structure for token estimation)
     if tools:
-        full_text += json.dumps(tools)
+        full_text += (
+            _TOOL_SCHEMA_JSON if tools is DOCSTRING_TOOL_SCHEMA else json.dumps(tools)
+        )
 
     # 3. Count Tokens
-    try:
-        encoding = tiktoken.encoding_for_model(model)
-    except KeyError:
-        # Fallback to a sensible default encoding when model-specific one is missing
-        encoding = tiktoken.get_encoding("cl100k_base")
-
     # Add message overhead (approx 4 tokens per message for OpenAI-style protocols)
     # The overhead accounts for structural tokens
     # (role/name/delimiters) not present in raw content.
-    token_count = len(encoding.encode(full_text)) + (len(messages) * 4)
+    token_count = count_tokens(full_text, model) + (len(messages) * 4)
 
     # 4. Calculate Cost
     input_price = price_info.get("input_cost_per_million", 0.0)
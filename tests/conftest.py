@@ -24,3 +24,27 @@ def mock_openai_client(mocker):
 def sample_python_code():
     """Returns a string of valid Python code for testing parsing/rewriting."""
     return "def hello():\n    print('world')"
+
+
+def _clear_process_caches():
+    """Reset every process-wide cache the package keeps between calls."""
+    from src.ai_docify import config, generator, utils
+
+    utils._get_encoding.cache_clear()
+    generator.create_client.cache_clear()
+    generator._template_cache.update(key=None, template=None, prompts={})
+    config.load_config.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path, monkeypatch):
+    """Keep on-disk caches out of the home dir and in-process caches per test."""
+    from src.ai_docify import utils
+
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setattr(utils, "_token_counts", None)
+    # Restored to False afterwards, so exit hooks registered by tests are no-ops
+    monkeypatch.setattr(utils, "_token_counts_dirty", False)
+    _clear_process_caches()
+    yield
+    _clear_process_caches()
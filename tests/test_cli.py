@@ -1,8 +1,16 @@
+import json
+import shutil
 import pytest
 from click.testing import CliRunner
 from unittest.mock import patch
+from rich.console import Console
 
-from src.ai_docify.cli import main
+from src.ai_docify.cli import (
+    main,
+    get_api_key,
+    print_final_usage_report,
+    write_output_file,
+)
 from src.ai_docify.generator import AIDocifyError
 
 
@@ -62,6 +70,7 @@ def test_cli_success_with_confirmation(
     mock_prompt.assert_called_once()
     mock_generate.assert_called_once()
     mock_write.assert_called_once()
+    assert mock_write.call_args[0][1] == "my_script.doc.py"
     assert "Successfully generated documentation!" in result.output
     assert "Final Usage Report" in result.output
 
@@ -184,3 +193,288 @@ def test_cli_api_error(
     assert "Error generating documentation: API is down" in result.output
     assert "Successfully generated documentation!" not in result.output
     assert "Final Usage Report" not in result.output
+
+
+@pytest.mark.parametrize(
+    "provider, env, expected",
+    [
+        ("openai", {"OPENAI_API_KEY": "sk-test"}, "sk-test"),
+        ("OpenAI", {"OPENAI_API_KEY": "sk-test"}, "sk-test"),
+        ("openai", {"OPENAI_API_KEY": ""}, None),
+        ("ollama", {}, "ollama"),
+        ("unknown", {"OPENAI_API_KEY": "sk-test"}, None),
+    ],
+)
+def test_get_api_key(provider, env, expected):
+    """Test API key lookup for known, case-varied, and unknown providers."""
+    with patch.dict("os.environ", env):
+        assert get_api_key(provider) == expected
+
+
+def test_write_output_file_creates_and_truncates(tmp_path):
+    """Test that output is written as UTF-8 and replaces any previous content."""
+    output_dir = tmp_path / "ai_output"
+
+    write_output_file(output_dir, "out.py", "x = 'a much longer first version'\n")
+    path = write_output_file(output_dir, "out.py", "y = 'é'\n")
+
+    assert path == output_dir / "out.py"
+    assert path.read_bytes() == "y = 'é'\n".encode("utf-8")
+
+
+def test_write_output_file_failure_keeps_previous_output(tmp_path):
+    """Test that a failed write leaves the old file intact and no temp file."""
+    output_dir = tmp_path / "ai_output"
+    write_output_file(output_dir, "out.py", "old = 1\n")
+
+    with patch("src.ai_docify.cli.os.write", side_effect=OSError("disk full")):
+        with pytest.raises(IOError, match="disk full"):
+            write_output_file(output_dir, "out.py", "new = 2\n")
+
+    assert (output_dir / "out.py").read_text() == "old = 1\n"
+    assert [p.name for p in output_dir.iterdir()] == ["out.py"]
+
+
+@patch("src.ai_docify.cli.validate_model")
+def test_cli_choice_options_are_case_insensitive(mock_validate, runner, mock_file):
+    """Test that provider/mode choices accept any case and are canonicalized."""
+    mock_validate.return_value = False
+
+    result = runner.invoke(
+        main,
+        [
+            "generate",
+            mock_file,
+            "--provider",
+            "OpenAI",
+            "--model",
+            "m",
+            "--mode",
+            "INJECT",
+        ],
+    )
+
+    assert result.exit_code == 1
+    mock_validate.assert_called_once_with("openai", "m")
+
+
+def test_cli_invalid_choice(runner, mock_file):
+    """Test that an unknown provider is rejected with Click's usage error."""
+    result = runner.invoke(
+        main, ["generate", mock_file, "--provider", "bogus", "--model", "m"]
+    )
+
+    assert result.exit_code == 2
+    assert "Invalid value for '--provider'" in result.output
+
+
+def test_write_output_file_recreates_removed_directory(tmp_path):
+    """Test that a write succeeds after the output directory was deleted."""
+    output_dir = tmp_path / "ai_output"
+
+    write_output_file(output_dir, "a.py", "a = 1\n")
+    shutil.rmtree(output_dir)
+    write_output_file(output_dir, "b.py", "b = 2\n")
+
+    assert (output_dir / "b.py").read_text() == "b = 2\n"
+
+
+@patch("src.ai_docify.cli.get_model_price")
+def test_print_final_usage_report_paid(mock_price):
+    """Test the usage report lines for a paid model."""
+    mock_price.return_value = {
+        "input_cost_per_million": 1.0,
+        "output_cost_per_million": 2.0,
+    }
+    console = Console(record=True, width=80)
+
+    print_final_usage_report(
+        console,
+        {"input_tokens": 1000, "output_tokens": 500, "reasoning_tokens": 7},
+        "openai",
+        "gpt-4",
+    )
+
+    text = console.export_text()
+    assert "Final Usage Report:" in text
+    assert "Input Tokens:     1000" in text
+    assert "Output Tokens:    500" in text
+    assert "(Includes 7 reasoning tokens)" in text
+    assert "Total Cost:       $0.00200" in text
+
+
+@patch("src.ai_docify.cli.get_model_price")
+def test_print_final_usage_report_free(mock_price):
+    """Test the usage report lines for a free/local model."""
+    mock_price.return_value = {"input_cost_per_million": 0.0}
+    console = Console(record=True, width=80)
+
+    print_final_usage_report(console, {"output_tokens": 42}, "ollama", "llama2")
+
+    text = console.export_text()
+    assert "Output Tokens: 42" in text
+    assert "Total Cost:    Free" in text
+
+
+@patch("src.ai_docify.cli.validate_model")
+@patch("src.ai_docify.cli.estimate_cost")
+@patch("src.ai_docify.cli.generate_documentation")
+def test_cli_mixed_case_provider_requires_api_key(
+    mock_generate, mock_estimate, mock_validate, runner, mock_file, monkeypatch
+):
+    """Test that the API key check applies to a mixed-case OpenAI provider."""
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setattr("src.ai_docify.cli.load_dotenv", lambda: None)
+    mock_validate.return_value = True
+    mock_estimate.return_value = {"tokens": 1, "input_cost": 0.0, "currency": "USD"}
+
+    result = runner.invoke(
+        main,
+        ["generate", mock_file, "--provider", "OpenAI", "--model", "gpt-4", "--yes"],
+    )
+
+    assert result.exit_code == 1
+    assert "OPENAI_API_KEY environment variable is not set" in result.output
+    mock_generate.assert_not_called()
+
+
+@patch("src.ai_docify.cli.get_model_price")
+def test_print_final_usage_report_cached_tokens(mock_price):
+    """Test that cached input tokens are billed at the cached rate."""
+    mock_price.return_value = {
+        "input_cost_per_million": 1.0,
+        "cached_input_cost_per_million": 0.1,
+        "output_cost_per_million": 0.0,
+    }
+    console = Console(record=True, width=80)
+
+    print_final_usage_report(
+        console,
+        {"input_tokens": 1000, "output_tokens": 0, "cached_input_tokens": 800},
+        "openai",
+        "gpt-4",
+    )
+
+    text = console.export_text()
+    # 200 uncached at $1/M + 800 cached at $0.1/M = $0.00028
+    assert "(Includes 800 cached tokens)" in text
+    assert "Total Cost:       $0.00028" in text
+
+
+@patch("src.ai_docify.cli.logging.basicConfig")
+@patch("src.ai_docify.cli.validate_model", return_value=True)
+@patch("src.ai_docify.cli.estimate_cost")
+def test_cli_check_outputs_only_json(
+    mock_estimate, mock_validate, mock_basic_config, runner, mock_file
+):
+    """Test that --check prints only the JSON estimate and skips log setup."""
+    estimates = {"tokens": 12, "input_cost": 0.0, "currency": "Free/Local"}
+    mock_estimate.return_value = estimates
+
+    result = runner.invoke(
+        main,
+        ["generate", mock_file, "--provider", "ollama", "--model", "m", "--check"],
+    )
+
+    assert result.exit_code == 0
+    assert json.loads(result.stdout) == estimates
+    mock_basic_config.assert_not_called()
+
+
+@patch("src.ai_docify.cli.prompt_confirmation")
+@patch("src.ai_docify.cli.validate_model", return_value=True)
+@patch("src.ai_docify.cli.estimate_cost", side_effect=RuntimeError("no tokenizer"))
+def test_cli_check_estimation_failure(
+    mock_estimate, mock_validate, mock_prompt, runner, mock_file
+):
+    """Test that a failed estimate in --check mode exits instead of prompting."""
+    result = runner.invoke(
+        main,
+        ["generate", mock_file, "--provider", "ollama", "--model", "m", "--check"],
+    )
+
+    assert result.exit_code == 1
+    assert result.stdout == ""
+    assert "Could not estimate cost: no tokenizer" in result.stderr
+    mock_prompt.assert_not_called()
+
+
+@patch("src.ai_docify.cli.validate_model", return_value=False)
+def test_cli_check_errors_go_to_stderr(mock_validate, runner, mock_file):
+    """Test that --check keeps configuration errors off stdout."""
+    result = runner.invoke(
+        main,
+        ["generate", mock_file, "--provider", "ollama", "--model", "m", "--check"],
+        env={"COLUMNS": "400"},
+    )
+
+    assert result.exit_code == 1
+    assert result.stdout == ""
+    assert "is not configured" in result.stderr
+
+
+@patch("src.ai_docify.cli.load_config")
+def test_cli_config_outputs_json(mock_load_config, runner):
+    """Test that the config command prints the pricing config as one JSON line."""
+    cfg = {"openai": {"gpt-5-mini": {"input_cost_per_million": 0.25}}}
+    mock_load_config.return_value = cfg
+
+    result = runner.invoke(main, ["config"])
+
+    assert result.exit_code == 0
+    assert result.stdout.count("\n") == 1
+    assert json.loads(result.stdout) == cfg
+
+
+@patch("src.ai_docify.cli.generate_documentation")
+@patch("src.ai_docify.cli.validate_model", return_value=True)
+@patch("src.ai_docify.cli.estimate_cost")
+def test_cli_empty_file_skips_generation(
+    mock_estimate, mock_validate, mock_generate, runner, tmp_path
+):
+    """Test that an empty file is neither tokenized nor sent to the model."""
+    empty_file = tmp_path / "empty.py"
+    empty_file.write_text("\n")
+
+    result = runner.invoke(
+        main,
+        ["generate", str(empty_file), "--provider", "ollama", "--model", "m", "-y"],
+        env={"COLUMNS": "400"},
+    )
+
+    assert result.exit_code == 0
+    assert "empty.py is empty. Nothing to document." in result.output
+    mock_estimate.assert_not_called()
+    mock_generate.assert_not_called()
+
+
+@patch("src.ai_docify.cli.get_model_price", return_value={})
+@patch("src.ai_docify.cli.validate_model", return_value=True)
+@patch("src.ai_docify.cli.estimate_cost")
+def test_cli_check_empty_file(
+    mock_estimate, mock_validate, mock_price, runner, tmp_path
+):
+    """Test that --check reports a zero estimate for an empty file."""
+    empty_file = tmp_path / "empty.py"
+    empty_file.write_text("")
+
+    result = runner.invoke(
+        main,
+        [
+            "generate",
+            str(empty_file),
+            "--provider",
+            "ollama",
+            "--model",
+            "m",
+            "--check",
+        ],
+    )
+
+    assert result.exit_code == 0
+    assert json.loads(result.stdout) == {
+        "tokens": 0,
+        "input_cost": 0.0,
+        "currency": "Free/Local",
+    }
+    mock_estimate.assert_not_called()
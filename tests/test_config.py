@@ -24,10 +24,8 @@ MOCK_CONFIG = {
 # --- Tests for load_config ---
 
 
-@patch("src.ai_docify.config.CONFIG_PATH")
-def test_load_config_success(mock_path):
+def test_load_config_success():
     """Test successful loading of a valid config file."""
-    mock_path.exists.return_value = True
     mock_file_content = json.dumps(MOCK_CONFIG)
 
     with patch("builtins.open", mock_open(read_data=mock_file_content)) as mock_file:
@@ -38,12 +36,21 @@ def test_load_config_success(mock_path):
         assert mock_file.called
 
 
-@patch("src.ai_docify.config.CONFIG_PATH")
-def test_load_config_file_not_found(mock_path):
+def test_load_config_is_cached():
+    """Test that pricing.json is only read once across repeated lookups."""
+    with patch("builtins.open", mock_open(read_data=json.dumps(MOCK_CONFIG))) as m:
+        assert load_config() is load_config()
+        assert validate_model("openai", "gpt-4") is True
+        assert m.call_count == 1
+
+
+def test_load_config_file_not_found():
     """Test that default config is returned if config file does not exist."""
-    mock_path.exists.return_value = False
-    config = load_config()
+    with patch("builtins.open", side_effect=FileNotFoundError) as mock_file:
+        config = load_config()
     assert config == DEFAULT_CONFIG
+    # The open attempt itself is the existence check
+    mock_file.assert_called_once()
 
 
 # --- Tests for validate_model ---
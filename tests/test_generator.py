@@ -1,3 +1,7 @@
+import os
+import threading
+from pathlib import Path
+
 import pytest
 import json
 from unittest.mock import MagicMock, patch
@@ -7,6 +11,10 @@ from openai import OpenAIError
 from src.ai_docify.generator import (
     generate_documentation,
     prepare_llm_payload,
+    create_client,
+    _usage_detail,
+    _read_cached_response,
+    _write_cached_response,
     DOCSTRING_TOOL_SCHEMA,
     AIDocifyError,
 )
@@ -43,9 +51,8 @@ def test_docstring_tool_schema_structure():
     assert tool["function"]["strict"] is True
 
 
-@patch("src.ai_docify.generator.Path.exists", return_value=True)
 @patch("builtins.open")
-def test_prepare_llm_payload_rewrite(mock_open_func, mock_exists):
+def test_prepare_llm_payload_rewrite(mock_open_func):
     """Test payload construction for rewrite mode."""
     mock_open_func.return_value.__enter__.return_value.read.return_value = json.dumps(
         MOCK_TEMPLATE
@@ -60,9 +67,8 @@ def test_prepare_llm_payload_rewrite(mock_open_func, mock_exists):
     assert payload["messages"][1]["content"] == "User Rewrite: def foo(): pass"
 
 
-@patch("src.ai_docify.generator.Path.exists", return_value=True)
 @patch("builtins.open")
-def test_prepare_llm_payload_inject(mock_open_func, mock_exists):
+def test_prepare_llm_payload_inject(mock_open_func):
     """Test payload construction for inject mode (should include tools)."""
     mock_open_func.return_value.__enter__.return_value.read.return_value = json.dumps(
         MOCK_TEMPLATE
@@ -76,10 +82,68 @@ def test_prepare_llm_payload_inject(mock_open_func, mock_exists):
     assert payload["tools"] == DOCSTRING_TOOL_SCHEMA
 
 
+@patch("builtins.open")
+def test_prepare_llm_payload_reuses_cached_template(mock_open_func):
+    """Test that the template file is only read once across payload builds."""
+    mock_open_func.return_value.__enter__.return_value.read.return_value = json.dumps(
+        MOCK_TEMPLATE
+    )
+
+    prepare_llm_payload("def foo(): pass", mode="rewrite")
+    prepare_llm_payload("def bar(): pass", mode="inject")
+
+    assert mock_open_func.call_count == 1
+
+
+@patch("builtins.open")
+def test_prepare_llm_payload_preserves_braces_in_source(mock_open_func):
+    """Test that braces in the source are inserted verbatim into the prompt."""
+    mock_open_func.return_value.__enter__.return_value.read.return_value = json.dumps(
+        MOCK_TEMPLATE
+    )
+
+    payload = prepare_llm_payload("x = {'a': '{raw_text}'}", mode="rewrite")
+
+    assert payload["messages"][1]["content"] == "User Rewrite: x = {'a': '{raw_text}'}"
+
+
+def test_prepare_llm_payload_reloads_changed_template(tmp_path, monkeypatch):
+    """Test that edits to the template file invalidate the cached template."""
+    template_file = tmp_path / "template.json"
+    template_file.write_text(json.dumps(MOCK_TEMPLATE))
+    monkeypatch.setattr("src.ai_docify.generator.TEMPLATE_PATH", str(template_file))
+
+    first = prepare_llm_payload("x", mode="rewrite")
+
+    updated = dict(
+        MOCK_TEMPLATE, rewrite={"system_prompt": "S2", "user_prompt": "U2 {raw_text}!"}
+    )
+    template_file.write_text(json.dumps(updated))
+    second = prepare_llm_payload("x", mode="rewrite")
+
+    assert first["messages"][1]["content"] == "User Rewrite: x"
+    assert second["messages"][0]["content"] == "S2"
+    assert second["messages"][1]["content"] == "U2 x!"
+
+
+@pytest.mark.parametrize("mode", ["rewrite", "inject"])
+def test_prompt_source_is_trailing_content(mode):
+    """Test that the source is the only varying (trailing) part of the messages."""
+    first = prepare_llm_payload("a = 1", mode=mode)["messages"]
+    second = prepare_llm_payload("b = 2", mode=mode)["messages"]
+
+    assert first[0] == second[0]
+    assert first[1]["content"].endswith("```python\na = 1\n```")
+    assert (
+        first[1]["content"][: -len("a = 1\n```")]
+        == second[1]["content"][: -len("b = 2\n```")]
+    )
+
+
 # --- Part 2: Generator Execution Tests ---
 
 
-@patch("src.ai_docify.generator.OpenAI")
+@patch("openai.OpenAI")
 def test_generate_documentation_ollama_connection(mock_openai, mock_console):
     """Test that Ollama provider initializes OpenAI client with local base_url."""
     # Setup mock to avoid crash
@@ -102,7 +166,7 @@ def test_generate_documentation_ollama_connection(mock_openai, mock_console):
     )
 
 
-@patch("src.ai_docify.generator.OpenAI")
+@patch("openai.OpenAI")
 def test_generate_documentation_openai_connection(mock_openai, mock_console):
     """Test that OpenAI provider initializes client with api_key."""
     mock_client = mock_openai.return_value
@@ -122,6 +186,15 @@ def test_generate_documentation_openai_connection(mock_openai, mock_console):
     mock_openai.assert_called_with(api_key="sk-test")
 
 
+@patch("openai.OpenAI")
+def test_create_client_is_cached_per_key(mock_openai):
+    """Test that clients are reused for the same provider and API key."""
+    assert create_client("openai", "sk-a") is create_client("openai", "sk-a")
+    create_client("openai", "sk-b")
+
+    assert mock_openai.call_count == 2
+
+
 def test_generate_documentation_missing_api_key(mock_console):
     """Test error when API key is missing for non-Ollama provider."""
     with pytest.raises(AIDocifyError, match="API key is required for OpenAI"):
@@ -135,7 +208,7 @@ def test_generate_documentation_missing_api_key(mock_console):
 
 
 @patch("src.ai_docify.generator.prepare_llm_payload")
-@patch("src.ai_docify.generator.OpenAI")
+@patch("openai.OpenAI")
 def test_generate_documentation_rewrite_success(
     mock_openai, mock_prepare, mock_console
 ):
@@ -152,6 +225,7 @@ def test_generate_documentation_rewrite_success(
     mock_response.usage.completion_tokens = 20
     # Mock reasoning tokens
     mock_response.usage.completion_tokens_details.reasoning_tokens = 5
+    mock_response.usage.prompt_tokens_details.cached_tokens = 4
 
     mock_client.chat.completions.create.return_value = mock_response
 
@@ -168,11 +242,44 @@ def test_generate_documentation_rewrite_success(
     assert usage["input_tokens"] == 10
     assert usage["output_tokens"] == 20
     assert usage["reasoning_tokens"] == 5
+    assert usage["cached_input_tokens"] == 4
+
+
+@pytest.mark.parametrize(
+    "content, expected",
+    [
+        ("```python\n\nx = 1\n\n```", "x = 1"),
+        ("x = 1\n```\n", "x = 1\n```\n"),
+        ("x = 1\n```", "x = 1"),
+        ("x = 1\n", "x = 1\n"),
+        ("```python```", ""),
+    ],
+)
+@patch("src.ai_docify.generator.prepare_llm_payload")
+@patch("openai.OpenAI")
+def test_generate_documentation_rewrite_fence_stripping(
+    mock_openai, mock_prepare, content, expected, mock_console
+):
+    """Test that only surrounding markdown fences and their padding are removed."""
+    mock_prepare.return_value = {"messages": []}
+    mock_response = mock_openai.return_value.chat.completions.create.return_value
+    mock_response.choices[0].message.content = content
+
+    doc_code, _ = generate_documentation(
+        file_content="x = 1",
+        provider="ollama",
+        model="llama2",
+        api_key=None,
+        mode="rewrite",
+        console=mock_console,
+    )
+
+    assert doc_code == expected
 
 
 @patch("src.ai_docify.generator.insert_docstrings_to_source")
 @patch("src.ai_docify.generator.prepare_llm_payload")
-@patch("src.ai_docify.generator.OpenAI")
+@patch("openai.OpenAI")
 def test_generate_documentation_inject_success(
     mock_openai, mock_prepare, mock_insert, mock_console
 ):
@@ -212,8 +319,66 @@ def test_generate_documentation_inject_success(
     assert "Docstring" in doc_code
 
 
+@patch("src.ai_docify.generator._json_loads", side_effect=json.loads)
+@patch("src.ai_docify.generator.insert_docstrings_to_source")
 @patch("src.ai_docify.generator.prepare_llm_payload")
-@patch("src.ai_docify.generator.OpenAI")
+@patch("openai.OpenAI")
+def test_generate_documentation_inject_duplicate_tool_calls(
+    mock_openai, mock_prepare, mock_insert, mock_loads, mock_console
+):
+    """Test that repeated tool calls are decoded once and the last revision wins."""
+    calls = []
+    for name, body in [("f", "First"), ("f", "First"), ("f", "Revised")]:
+        tool_call = MagicMock()
+        tool_call.function.name = "generate_one_docstring"
+        tool_call.function.arguments = json.dumps({"name": name, "body": body})
+        calls.append(tool_call)
+    mock_prepare.return_value = {"messages": [], "tools": []}
+    mock_response = mock_openai.return_value.chat.completions.create.return_value
+    mock_response.choices[0].message.tool_calls = calls
+
+    generate_documentation(
+        file_content="def f(): pass",
+        provider="ollama",
+        model="llama2",
+        api_key=None,
+        mode="inject",
+        console=mock_console,
+    )
+
+    assert mock_loads.call_count == 2
+    assert mock_insert.call_args[0][1] == {"f": "Revised"}
+
+
+@patch("src.ai_docify.generator.prepare_llm_payload")
+@patch("openai.OpenAI")
+def test_generate_documentation_reuses_supplied_payload(
+    mock_openai, mock_prepare, mock_console
+):
+    """Test that a pre-built payload is sent without being rebuilt."""
+    mock_client = mock_openai.return_value
+    mock_client.chat.completions.create.return_value.choices = [
+        MagicMock(message=MagicMock(content="code"))
+    ]
+    payload = {"messages": [{"role": "user", "content": "prebuilt"}]}
+
+    generate_documentation(
+        file_content="pass",
+        provider="openai",
+        model="gpt-4",
+        api_key="sk-test",
+        console=mock_console,
+        payload=payload,
+    )
+
+    mock_prepare.assert_not_called()
+    mock_client.chat.completions.create.assert_called_once_with(
+        model="gpt-4", messages=payload["messages"]
+    )
+
+
+@patch("src.ai_docify.generator.prepare_llm_payload")
+@patch("openai.OpenAI")
 def test_generate_documentation_api_error(mock_openai, mock_prepare, mock_console):
     """Test handling of OpenAIError."""
     mock_prepare.return_value = {"messages": []}
@@ -228,3 +393,146 @@ def test_generate_documentation_api_error(mock_openai, mock_prepare, mock_consol
             api_key="sk-test",
             console=mock_console,
         )
+
+
+@pytest.mark.parametrize(
+    "details, expected",
+    [
+        ({"reasoning_tokens": 7}, 7),
+        ({"reasoning_tokens": None}, 0),
+        ({}, 0),
+        (MagicMock(reasoning_tokens=3), 3),
+        (MagicMock(spec=[]), 0),
+        (None, 0),
+    ],
+)
+def test_usage_detail_shapes(details, expected):
+    """Test that token details are read from dicts, objects or missing blocks."""
+    assert _usage_detail(details, "reasoning_tokens") == expected
+
+
+@patch("rich.console.Console")
+@patch("openai.OpenAI")
+def test_generate_documentation_without_console_is_silent(
+    mock_openai, mock_console_cls
+):
+    """Test that no Console is created when the caller does not supply one."""
+    mock_response = mock_openai.return_value.chat.completions.create.return_value
+    mock_response.choices[0].message.content = "x = 1"
+
+    doc_code, _ = generate_documentation(
+        file_content="x = 1", provider="ollama", model="llama2", api_key=None
+    )
+
+    assert doc_code == "x = 1"
+    mock_console_cls.assert_not_called()
+
+
+@patch("openai.OpenAI")
+def test_generate_documentation_response_cache(mock_openai, mock_console):
+    """Test that cached results skip the API and report no token usage."""
+    mock_create = mock_openai.return_value.chat.completions.create
+    mock_create.return_value.choices[0].message.content = "x = 1  # documented"
+    mock_create.return_value.usage.prompt_tokens = 10
+    mock_create.return_value.usage.completion_tokens = 5
+
+    kwargs = dict(provider="ollama", api_key=None, console=mock_console, cache=True)
+    first, first_usage = generate_documentation("x = 1", model="llama2", **kwargs)
+    second, second_usage = generate_documentation("x = 1", model="llama2", **kwargs)
+
+    assert first == second == "x = 1  # documented"
+    assert first_usage["input_tokens"] == 10
+    assert second_usage["input_tokens"] == second_usage["output_tokens"] == 0
+    assert mock_create.call_count == 1
+
+    # A different model (or source, prompt or mode) is a different request
+    generate_documentation("x = 1", model="llama3", **kwargs)
+    # Without the flag the cache is neither read nor written
+    generate_documentation("x = 1", model="llama2", provider="ollama", api_key=None)
+    assert mock_create.call_count == 3
+
+
+@patch("openai.OpenAI")
+def test_generate_documentation_response_cache_keys_on_whole_file(
+    mock_openai, mock_console
+):
+    """Test that a targeted run misses the cache when the rest of the file changed."""
+    mock_tool_call = MagicMock()
+    mock_tool_call.function.name = "generate_one_docstring"
+    mock_tool_call.function.arguments = json.dumps({"name": "f", "body": "Doc."})
+    mock_create = mock_openai.return_value.chat.completions.create
+    mock_create.return_value.choices[0].message.tool_calls = [mock_tool_call]
+
+    kwargs = dict(
+        provider="ollama",
+        model="llama2",
+        api_key=None,
+        mode="inject",
+        console=mock_console,
+        function="f",
+        cache=True,
+    )
+    generate_documentation("def f():\n    pass\n", **kwargs)
+    edited, _ = generate_documentation("def f():\n    pass\n\nX = 2\n", **kwargs)
+
+    assert mock_create.call_count == 2
+    assert "X = 2" in edited
+
+
+def test_write_cached_response_concurrent_writers(tmp_path, caplog):
+    """Test that threads writing the same cache entry do not share a temp file."""
+    path = str(tmp_path / "responses" / "entry.json")
+    barrier = threading.Barrier(4)
+    real_replace = os.replace
+
+    def synchronized_replace(src, dst):
+        # Every writer has finished writing its temp file before any rename
+        barrier.wait(timeout=5)
+        real_replace(src, dst)
+
+    with patch("src.ai_docify.generator.os.replace", synchronized_replace):
+        threads = [
+            threading.Thread(target=_write_cached_response, args=(path, f"r{i}"))
+            for i in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert json.loads(Path(path).read_text())["result"] in {"r0", "r1", "r2", "r3"}
+    assert os.listdir(tmp_path / "responses") == ["entry.json"]
+    assert "Could not cache" not in caplog.text
+
+
+def test_response_cache_evicts_least_recently_used(tmp_path):
+    """Test that the response cache keeps only the most recently used entries."""
+    directory = tmp_path / "responses"
+    paths = [str(directory / f"{i}.json") for i in range(4)]
+
+    with patch("src.ai_docify.generator._RESPONSE_CACHE_MAX_ENTRIES", 3):
+        for i, path in enumerate(paths[:3]):
+            _write_cached_response(path, f"r{i}")
+            os.utime(path, ns=(i * 10**9, i * 10**9))
+        # Reading the oldest entry makes it the most recently used
+        assert _read_cached_response(paths[0]) == "r0"
+        _write_cached_response(paths[3], "r3")
+
+    assert sorted(os.listdir(directory)) == ["0.json", "2.json", "3.json"]
+
+
+@patch("openai.OpenAI")
+def test_generate_documentation_empty_source_skips_api(mock_openai, mock_console):
+    """Test that whitespace-only source is returned unchanged without a request."""
+    doc_code, usage = generate_documentation(
+        file_content="\n\n",
+        provider="ollama",
+        model="llama2",
+        api_key=None,
+        mode="inject",
+        console=mock_console,
+    )
+
+    assert doc_code == "\n\n"
+    assert set(usage.values()) == {0}
+    mock_openai.assert_not_called()
@@ -1,8 +1,15 @@
+import shutil
+import sys
+import time
+
 import pytest
 from click.testing import CliRunner
 from pathlib import Path
+from unittest.mock import patch
 
 from src.ai_docify.cli import main
+from src.ai_docify.generator import AIDocifyError
+from src.ai_docify.stripper import strip_docstrings
 
 
 @pytest.fixture
@@ -47,6 +54,22 @@ def test_clean_with_files_and_confirmation(runner):
         assert not (output_dir / "file2.txt").exists()
 
 
+def test_clean_skips_subdirectories(runner):
+    """Test that clean lists and deletes files only, leaving subdirectories."""
+    with runner.isolated_filesystem():
+        output_dir = Path("ai_output")
+        (output_dir / "nested").mkdir(parents=True)
+        (output_dir / "[draft].doc.py").touch()
+
+        result = runner.invoke(main, ["clean", "--yes"])
+
+        assert result.exit_code == 0
+        assert "  - [draft].doc.py" in result.output
+        assert "Successfully deleted 1 file(s)" in result.output
+        assert (output_dir / "nested").is_dir()
+        assert not (output_dir / "[draft].doc.py").exists()
+
+
 def test_clean_with_files_and_abort(runner):
     """Test the clean command with files, aborting deletion."""
     with runner.isolated_filesystem():
@@ -92,7 +115,7 @@ def test_strip_success(runner, mock_strip_file):
         # The mock_strip_file is in a temporary directory, so we need to copy it
         # into the isolated filesystem to test the output directory creation.
         source_file = Path("my_script_to_strip.py")
-        source_file.write_text(Path(mock_strip_file).read_text())
+        shutil.copyfile(mock_strip_file, source_file)
 
         result = runner.invoke(main, ["strip", str(source_file)])
 
@@ -110,8 +133,260 @@ def test_strip_success(runner, mock_strip_file):
         assert "def my_func" in content
 
 
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="match needs Python 3.10")
+def test_strip_docstrings_handles_match_statements():
+    """Test that stripping works on modules using structural pattern matching."""
+    source = (
+        'def f(x):\n    """Doc."""\n'
+        "    match x:\n        case 1:\n            return 1\n"
+    )
+
+    stripped = strip_docstrings(source)
+
+    assert '"""Doc."""' not in stripped
+    assert "match x:" in stripped
+
+
+def test_strip_docstrings_keeps_docstring_only_bodies_valid():
+    """Test that a definition whose body is only a docstring becomes ``pass``."""
+    source = 'def f():\n    """Doc."""\n\n\nclass A:\n    """Doc."""\n'
+
+    stripped = strip_docstrings(source)
+
+    assert '"""Doc."""' not in stripped
+    compile(stripped, "<stripped>", "exec")
+
+
 def test_strip_file_not_found(runner):
     """Test that the strip command handles a non-existent file path."""
     result = runner.invoke(main, ["strip", "non_existent_file.py"])
     assert result.exit_code != 0
     assert "Error: Invalid value for 'FILEPATH'" in result.output
+
+
+# --- Tests for the 'generate-batch' command ---
+
+
+@pytest.fixture
+def batch_files(tmp_path):
+    """Fixture for two dummy source files to document in one batch."""
+    paths = []
+    for name in ("b_module.py", "a_module.py"):
+        path = tmp_path / name
+        path.write_text(f"def {name[0]}(): pass\n")
+        paths.append(str(path))
+    return paths
+
+
+def invoke_batch(runner, batch_files, output_dir):
+    """Run generate-batch over the given files with the Ollama provider."""
+    return runner.invoke(
+        main,
+        ["generate-batch", *batch_files, "--provider", "ollama", "--model", "m"]
+        + ["--yes", "--output-dir", str(output_dir)],
+        # Wide terminal so Rich does not wrap the long temporary paths
+        env={"COLUMNS": "400"},
+    )
+
+
+@patch("src.ai_docify.cli.validate_model", return_value=True)
+@patch("src.ai_docify.cli.estimate_cost")
+@patch("src.ai_docify.cli.create_client")
+@patch("src.ai_docify.cli.generate_documentation")
+def test_generate_batch_success(
+    mock_generate,
+    mock_client,
+    mock_estimate,
+    mock_validate,
+    runner,
+    batch_files,
+    tmp_path,
+):
+    """Test a batch run that shares one client and aggregates usage."""
+    mock_estimate.return_value = {"tokens": 10, "input_cost": 0.5, "currency": "USD"}
+    mock_generate.return_value = ("# doc", {"input_tokens": 3, "output_tokens": 4})
+    output_dir = tmp_path / "out"
+
+    result = invoke_batch(runner, batch_files, output_dir)
+
+    assert result.exit_code == 0
+    assert (output_dir / "a_module.doc.py").read_text() == "# doc"
+    assert (output_dir / "b_module.doc.py").read_text() == "# doc"
+    mock_client.assert_called_once_with("ollama", "ollama")
+    assert mock_generate.call_count == 2
+    for call in mock_generate.call_args_list:
+        assert call.kwargs["client"] is mock_client.return_value
+    # Results are reported in sorted order regardless of completion order
+    assert result.output.index("a_module.doc.py") < result.output.index(
+        "b_module.doc.py"
+    )
+    assert "Tokens: 20" in result.output
+    assert "Documented 2 of 2 file(s)." in result.output
+    assert "Output Tokens: 8" in result.output
+
+
+@patch("src.ai_docify.cli.validate_model", return_value=True)
+@patch("src.ai_docify.cli.estimate_cost")
+@patch("src.ai_docify.cli.create_client")
+@patch("src.ai_docify.cli.generate_documentation")
+def test_generate_batch_continues_after_failure(
+    mock_generate,
+    mock_client,
+    mock_estimate,
+    mock_validate,
+    runner,
+    batch_files,
+    tmp_path,
+):
+    """Test that one failing file does not stop the rest of the batch."""
+    mock_estimate.return_value = {"tokens": 1, "input_cost": 0.0, "currency": "x"}
+
+    def fake_generate(file_content, **kwargs):
+        if "def a" in file_content:
+            raise AIDocifyError("boom")
+        return "# doc", {"output_tokens": 1}
+
+    mock_generate.side_effect = fake_generate
+    output_dir = tmp_path / "out"
+
+    result = invoke_batch(runner, batch_files, output_dir)
+
+    assert result.exit_code == 1
+    assert not (output_dir / "a_module.doc.py").exists()
+    assert (output_dir / "b_module.doc.py").exists()
+    assert "boom" in result.output
+    assert "Documented 1 of 2 file(s)." in result.output
+
+
+@patch("src.ai_docify.cli.validate_model", return_value=True)
+@patch("src.ai_docify.cli.estimate_cost")
+@patch("src.ai_docify.cli.generate_documentation")
+def test_generate_batch_rejects_files_sharing_a_name(
+    mock_generate, mock_estimate, mock_validate, runner, tmp_path
+):
+    """Test that files whose outputs would overwrite each other are refused."""
+    paths = []
+    for folder in ("a", "b"):
+        (tmp_path / folder).mkdir()
+        path = tmp_path / folder / "x.py"
+        path.write_text("def x(): pass\n")
+        paths.append(str(path))
+
+    result = invoke_batch(runner, paths, tmp_path / "out")
+
+    assert result.exit_code == 1
+    assert "would all be saved as x.doc.py" in result.output
+    mock_estimate.assert_not_called()
+    mock_generate.assert_not_called()
+    assert not (tmp_path / "out").exists()
+
+
+@patch("src.ai_docify.cli.validate_model", return_value=True)
+@patch("src.ai_docify.cli.estimate_cost")
+@patch("src.ai_docify.cli.create_client")
+@patch("src.ai_docify.cli.generate_documentation")
+def test_generate_batch_skips_files_failing_preflight(
+    mock_generate,
+    mock_client,
+    mock_estimate,
+    mock_validate,
+    runner,
+    batch_files,
+    tmp_path,
+):
+    """Test that a file failing estimation is reported and the rest documented."""
+
+    def fake_estimate(file_content, *args, **kwargs):
+        if "def a" in file_content:
+            raise AIDocifyError("cannot estimate")
+        return {"tokens": 1, "input_cost": 0.0, "currency": "x"}
+
+    mock_estimate.side_effect = fake_estimate
+    mock_generate.return_value = ("# doc", {"output_tokens": 1})
+    undecodable = tmp_path / "c_module.py"
+    undecodable.write_bytes(b"\xff\xfe not utf-8")
+    output_dir = tmp_path / "out"
+
+    result = invoke_batch(runner, batch_files + [str(undecodable)], output_dir)
+
+    assert result.exit_code == 1
+    assert "cannot estimate" in result.output
+    assert "Error preparing" in result.output and "c_module.py" in result.output
+    assert mock_generate.call_count == 1
+    assert (output_dir / "b_module.doc.py").exists()
+    assert "Documented 1 of 3 file(s)." in result.output
+
+
+@patch("src.ai_docify.cli.validate_model", return_value=True)
+@patch("src.ai_docify.cli.estimate_cost")
+@patch("src.ai_docify.cli.create_client")
+@patch("src.ai_docify.cli.generate_documentation")
+def test_generate_batch_skips_empty_files(
+    mock_generate,
+    mock_client,
+    mock_estimate,
+    mock_validate,
+    runner,
+    batch_files,
+    tmp_path,
+):
+    """Test that empty files are neither estimated, sent nor written."""
+    mock_estimate.return_value = {"tokens": 1, "input_cost": 0.0, "currency": "x"}
+    mock_generate.return_value = ("# doc", {"output_tokens": 1})
+    empty = tmp_path / "c_module.py"
+    empty.write_text("  \n\n")
+    output_dir = tmp_path / "out"
+
+    result = invoke_batch(runner, batch_files + [str(empty)], output_dir)
+
+    assert result.exit_code == 0
+    assert "c_module.py is empty. Nothing to document." in result.output
+    assert mock_estimate.call_count == 2
+    assert mock_generate.call_count == 2
+    assert not (output_dir / "c_module.doc.py").exists()
+    assert "Documented 2 of 3 file(s)." in result.output
+
+    # A batch of nothing but empty files is not an error either
+    mock_generate.reset_mock()
+    result = invoke_batch(runner, [str(empty)], output_dir)
+
+    assert result.exit_code == 0
+    assert "Nothing to document." in result.output
+    assert "No files left to document." not in result.output
+    mock_generate.assert_not_called()
+
+
+@patch("src.ai_docify.cli.validate_model", return_value=True)
+@patch("src.ai_docify.cli.estimate_cost")
+@patch("src.ai_docify.cli.create_client")
+@patch("src.ai_docify.cli.generate_documentation")
+def test_generate_batch_interrupt_cancels_queued_files(
+    mock_generate, mock_client, mock_estimate, mock_validate, runner, tmp_path
+):
+    """Test that Ctrl-C stops queued files from being sent to the model."""
+    mock_estimate.return_value = {"tokens": 1, "input_cost": 0.0, "currency": "x"}
+    paths = []
+    for i in range(12):
+        path = tmp_path / f"m{i:02d}.py"
+        path.write_text(f"def f{i}(): pass\n")
+        paths.append(str(path))
+
+    def fake_generate(file_content, **kwargs):
+        if "def f0()" in file_content:
+            raise KeyboardInterrupt
+        # Give the main thread time to cancel whatever is still queued
+        time.sleep(0.2)
+        return "# doc", {}
+
+    mock_generate.side_effect = fake_generate
+    output_dir = tmp_path / "out"
+
+    result = runner.invoke(
+        main,
+        ["generate-batch", *paths, "--provider", "ollama", "--model", "m"]
+        + ["--yes", "--output-dir", str(output_dir), "--concurrency", "1"],
+    )
+
+    assert result.exit_code == 1
+    # The interrupted call plus at most the one already picked up by the worker
+    assert mock_generate.call_count <= 2
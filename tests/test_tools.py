@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 from src.ai_docify.tools import insert_docstrings_to_source
 
 # --- Test Cases for insert_docstrings_to_source ---
@@ -132,3 +134,24 @@ def test_multi_line_docstring():
     expected = 'def my_func():\n    """\n    Line 1.\n    Line 2.\n    """\n    pass\n'
     result = insert_docstrings_to_source(source, docstring_map)
     assert result == expected
+
+
+def test_definitions_inside_conditional_blocks():
+    """Test that definitions nested in else/except blocks are still found."""
+    source = (
+        "try:\n    import x\nexcept ImportError:\n    def a():\n        pass\n"
+        "if x:\n    pass\nelse:\n    def b():\n        pass\n"
+    )
+    docstring_map = {"a": "A doc.", "b": "B doc."}
+    result = insert_docstrings_to_source(source, docstring_map)
+    assert '    def a():\n        """\n        A doc.\n        """\n' in result
+    assert '    def b():\n        """\n        B doc.\n        """\n' in result
+
+
+def test_no_matching_names_returns_source_unchanged():
+    """Test that a map naming no symbol in the source leaves it untouched."""
+    source = "def my_func():\n    pass\n"
+    with patch("src.ai_docify.tools.ast.parse") as mock_parse:
+        assert insert_docstrings_to_source(source, {"other": "Doc."}) == source
+        assert insert_docstrings_to_source(source, {}) == source
+    mock_parse.assert_not_called()
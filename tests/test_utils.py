@@ -48,7 +48,7 @@ def test_estimate_cost_paid_model(
     # Mock Tokenizer
     mock_encoding = MagicMock()
     # Simulate "sys" + "usr" = 6 tokens
-    mock_encoding.encode.return_value = [1, 2, 3, 4, 5, 6]
+    mock_encoding.encode_ordinary.return_value = [1, 2, 3, 4, 5, 6]
     mock_tiktoken.encoding_for_model.return_value = mock_encoding
 
     # 2. Execute
@@ -57,7 +57,7 @@ def test_estimate_cost_paid_model(
     )
 
     # 3. Verify Logic
-    # Token count = len(encode("sysusr")) + (len(messages) * 4)
+    # Token count = len(encode_ordinary("sysusr")) + (len(messages) * 4)
     #             = 6 + (2 * 4) = 14 tokens
 
     expected_tokens = 6 + 8
@@ -88,7 +88,7 @@ def test_estimate_cost_free_model(
     }
 
     mock_encoding = MagicMock()
-    mock_encoding.encode.return_value = [1]
+    mock_encoding.encode_ordinary.return_value = [1]
     mock_tiktoken.encoding_for_model.return_value = mock_encoding
 
     result = estimate_cost("content", "ollama", "llama2")
@@ -103,7 +103,7 @@ def test_estimate_cost_tiktoken_fallback(mock_tiktoken):
     mock_tiktoken.encoding_for_model.side_effect = KeyError("Model not found")
 
     mock_fallback = MagicMock()
-    mock_fallback.encode.return_value = []
+    mock_fallback.encode_ordinary.return_value = []
     mock_tiktoken.get_encoding.return_value = mock_fallback
 
     with patch("src.ai_docify.utils.get_model_price") as mock_get_price, patch(
@@ -116,3 +116,112 @@ def test_estimate_cost_tiktoken_fallback(mock_tiktoken):
         estimate_cost("content", "provider", "unknown-model")
 
         mock_tiktoken.get_encoding.assert_called_with("cl100k_base")
+
+
+@patch("src.ai_docify.utils.get_model_price")
+@patch("src.ai_docify.utils.prepare_llm_payload")
+@patch("src.ai_docify.utils.tiktoken")
+def test_estimate_cost_reuses_supplied_payload(
+    mock_tiktoken, mock_prepare_payload, mock_get_model_price
+):
+    """Test that a pre-built payload is used instead of rebuilding one."""
+    mock_get_model_price.return_value = {"input_cost_per_million": 0.0}
+    mock_encoding = MagicMock()
+    mock_encoding.encode_ordinary.return_value = [1, 2]
+    mock_tiktoken.encoding_for_model.return_value = mock_encoding
+
+    payload = {"messages": [{"role": "user", "content": "hi"}]}
+    result = estimate_cost("content", "ollama", "llama2", payload=payload)
+
+    mock_prepare_payload.assert_not_called()
+    assert result["tokens"] == 2 + 4
+
+
+@patch("src.ai_docify.utils.get_model_price")
+@patch("src.ai_docify.utils.tiktoken")
+def test_estimate_cost_reuses_cached_token_count(mock_tiktoken, mock_get_model_price):
+    """Test that an unchanged payload is not re-tokenized, even across processes."""
+    from src.ai_docify import utils
+
+    mock_get_model_price.return_value = {"input_cost_per_million": 0.0}
+    mock_encoding = MagicMock()
+    mock_encoding.encode_ordinary.return_value = [1, 2, 3]
+    mock_tiktoken.encoding_for_model.return_value = mock_encoding
+    payload = {"messages": [{"role": "user", "content": "hi"}]}
+
+    first = estimate_cost("content", "ollama", "llama2", payload=payload)
+    # Simulate process exit and a fresh process: the count must come from disk
+    utils._save_token_counts()
+    utils._token_counts = None
+    second = estimate_cost("content", "ollama", "llama2", payload=payload)
+
+    assert first["tokens"] == second["tokens"] == 3 + 4
+    mock_encoding.encode_ordinary.assert_called_once()
+
+    # A different model uses a different tokenizer, so it is counted afresh
+    estimate_cost("content", "ollama", "other-model", payload=payload)
+    assert mock_encoding.encode_ordinary.call_count == 2
+
+
+@patch("src.ai_docify.utils.tiktoken")
+def test_count_tokens_looks_up_encoding_once_per_model(mock_tiktoken):
+    """Test that the tokenizer lookup is memoized across different texts."""
+    from src.ai_docify.utils import count_tokens
+
+    mock_tiktoken.encoding_for_model.return_value.encode_ordinary.return_value = [1]
+
+    count_tokens("first", "gpt-4")
+    count_tokens("second", "gpt-4")
+
+    mock_tiktoken.encoding_for_model.assert_called_once_with("gpt-4")
+
+
+@patch("src.ai_docify.utils.atexit")
+@patch("src.ai_docify.utils.tiktoken")
+def test_count_tokens_writes_cache_once_per_process(mock_tiktoken, mock_atexit):
+    """Test that new counts are saved by a single exit hook, not per miss."""
+    from src.ai_docify import utils
+
+    mock_tiktoken.encoding_for_model.return_value.encode_ordinary.return_value = [1]
+
+    with patch("src.ai_docify.utils.os.replace") as mock_replace:
+        utils.count_tokens("first", "gpt-4")
+        utils.count_tokens("second", "gpt-4")
+        mock_replace.assert_not_called()
+
+    mock_atexit.register.assert_called_once_with(utils._save_token_counts)
+
+
+@patch("src.ai_docify.utils.tiktoken")
+def test_token_cache_evicts_least_recently_used(mock_tiktoken, monkeypatch):
+    """Test that a cache hit protects the count from the next eviction."""
+    from src.ai_docify import utils
+
+    monkeypatch.setattr(utils, "_TOKEN_CACHE_MAX_ENTRIES", 2)
+    mock_encode = mock_tiktoken.encoding_for_model.return_value.encode_ordinary
+    mock_encode.return_value = [1]
+
+    utils.count_tokens("old", "gpt-4")
+    utils.count_tokens("middle", "gpt-4")
+    utils.count_tokens("old", "gpt-4")  # hit: now the most recently used
+    utils.count_tokens("new", "gpt-4")
+    utils._save_token_counts()
+    utils._token_counts = None
+    mock_encode.reset_mock()
+
+    utils.count_tokens("old", "gpt-4")
+    utils.count_tokens("new", "gpt-4")
+    mock_encode.assert_not_called()
+    utils.count_tokens("middle", "gpt-4")
+    mock_encode.assert_called_once_with("middle")
+
+
+def test_load_token_counts_drops_malformed_entries(tmp_path):
+    """Test that non-integer counts in the cache file are ignored."""
+    from src.ai_docify import utils
+
+    cache_file = tmp_path / "cache" / "ai-docify" / "token_counts.json"
+    cache_file.parent.mkdir(parents=True)
+    cache_file.write_text('{"good": 3, "text": "3", "none": null, "flag": true}')
+
+    assert utils._load_token_counts() == {"good": 3}